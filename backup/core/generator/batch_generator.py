@@ -148,22 +148,11 @@ def validate_instance_silent(filepath: str) -> bool:
     Returns:
         True si l'instance est valide, False sinon
     """
-    import io
-    import sys
-    
-    # Rediriger stdout pour supprimer les prints
-    old_stdout = sys.stdout
-    sys.stdout = io.StringIO()
-    
     try:
-        verificator = InstanceVerificator(filepath)
-        is_valid = verificator.verify()
-        return is_valid
+        verificator = InstanceVerificator(filepath, verbose=False)
+        return verificator.verify()
     except Exception:
         return False
-    finally:
-        # Restaurer stdout
-        sys.stdout = old_stdout
 
 
 def generate_random_params(category: str) -> dict:
@@ -1,7 +1,5 @@
-import random
 import os
 import re
-import argparse
 import uuid
 
 import numpy as np
@@ -9,6 +7,9 @@ import numpy as np
 
 def parse_args():
     """Parse les arguments en ligne de commande"""
+    # Import local : argparse n'est utile qu'en ligne de commande, pas lors d'un import du module
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Générateur d'instances MPVRP-CC",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -38,31 +39,75 @@ def parse_args():
     return parser.parse_args()
 
 
+# Dossier de sortie par défaut des instances générées (calculé une seule fois)
+DEFAULT_INSTANCES_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "instances")
+)
+
+# Pattern: MPVRP_{ID}_s{X}_d{Y}_p{Z}.dat
+_INSTANCE_FILENAME_PATTERN = re.compile(r'^MPVRP_(.+?)_s\d+_d\d+_p\d+\.dat$')
+
+# Cache des IDs par dossier : instances_dir -> (st_mtime_ns du dossier, IDs)
+_existing_ids_cache = {}
+
+
 def get_existing_instance_ids(instances_dir):
     """
     Récupère tous les IDs d'instances existants dans le dossier.
     
+    Le résultat est mis en cache tant que la date de modification du dossier ne change pas
+    (ajout, suppression ou renommage d'un fichier).
+    
     Args:
         instances_dir: Chemin vers le dossier des instances
     
     Returns:
         set: Ensemble des IDs existants
     """
-    existing_ids = set()
     if not os.path.exists(instances_dir):
-        return existing_ids
-    
-    # Pattern: MPVRP_{ID}_s{X}_d{Y}_p{Z}.dat
-    pattern = re.compile(r'^MPVRP_(.+?)_s\d+_d\d+_p\d+\.dat$')
+        return set()
     
-    for filename in os.listdir(instances_dir):
-        match = pattern.match(filename)
-        if match:
-            existing_ids.add(match.group(1))
+    mtime_ns = os.stat(instances_dir).st_mtime_ns
+    cached = _existing_ids_cache.get(instances_dir)
+    if cached is not None and cached[0] == mtime_ns:
+        return set(cached[1])
     
+    existing_ids = set()
+    with os.scandir(instances_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.dat'):
+                continue
+            match = _INSTANCE_FILENAME_PATTERN.match(entry.name)
+            if match:
+                existing_ids.add(match.group(1))
+    
+    _existing_ids_cache[instances_dir] = (mtime_ns, frozenset(existing_ids))
     return existing_ids
 
 
+def _format_block(array, fmt):
+    """
+    Formate un tableau 2D comme np.savetxt(..., fmt=fmt, delimiter='\t'), en une seule opération
+    de formatage au lieu d'une écriture par ligne.
+    """
+    if array.size == 0:
+        return ""
+    row_format = "\t".join([fmt] * array.shape[1]) + "\n"
+    return (row_format * array.shape[0]) % tuple(array.ravel().tolist())
+
+
+def _as_table(data, width):
+    """Tableau 2D de flottants (une ligne par entité), y compris pour une entité sans aucune ligne."""
+    table = np.asarray(data, dtype=np.float64)
+    if table.size == 0:
+        return np.zeros((0, width))
+    return table
+
+
+# Nombre maximal de distances calculées à la fois par le test de chevauchement de validate_instance
+_OVERLAP_BLOCK_SIZE = 1 << 20
+
+
 def validate_instance(params, vehicles, depots, garages, stations, transition_costs, nb_p):
     """Valide l'instance avant écriture"""
     errors = []
@@ -82,17 +127,23 @@ def validate_instance(params, vehicles, depots, garages, stations, transition_co
     if nb_p_val < 1:
         errors.append("Au moins 1 produit requis")
     
+    # Instance dégénérée : inutile (et risqué sur des tableaux vides) de poursuivre les vérifications
+    if errors:
+        return errors, warnings
+    
     # Vérification IDs uniques ET contigus [1, n]
-    entity_counts = [('véhicules', vehicles, nb_v), ('dépôts', depots, nb_d), 
-                     ('garages', garages, nb_g), ('stations', stations, nb_s)]
+    vehicles_t, depots_t = _as_table(vehicles, 4), _as_table(depots, 3 + nb_p)
+    garages_t, stations_t = _as_table(garages, 3), _as_table(stations, 3 + nb_p)
+    entity_counts = [('véhicules', vehicles_t, nb_v), ('dépôts', depots_t, nb_d), 
+                     ('garages', garages_t, nb_g), ('stations', stations_t, nb_s)]
     for name, data, expected_count in entity_counts:
-        ids = [int(row[0]) for row in data]
+        ids = data[:, 0].astype(np.int64)
         # IDs uniques
-        if len(ids) != len(set(ids)):
+        if np.unique(ids).size != ids.size:
             errors.append(f"IDs dupliqués pour {name}")
         # IDs contigus [1, n]
         expected_ids = set(range(1, expected_count + 1))
-        actual_ids = set(ids)
+        actual_ids = set(ids.tolist())
         if actual_ids != expected_ids:
             missing = expected_ids - actual_ids
             extra = actual_ids - expected_ids
@@ -101,73 +152,70 @@ def validate_instance(params, vehicles, depots, garages, stations, transition_co
             if extra:
                 errors.append(f"IDs hors plage pour {name}: {sorted(extra)} (attendu: 1-{expected_count})")
     
+    vehicle_ids = vehicles_t[:, 0].astype(np.int64)
+    
     # Vérification garages utilisés existent
-    garage_ids = set(int(g[0]) for g in garages)
-    for v in vehicles:
-        if int(v[2]) not in garage_ids:
-            errors.append(f"Véhicule {int(v[0])} utilise garage inexistant {int(v[2])}")
+    vehicle_garages = vehicles_t[:, 2].astype(np.int64)
+    unknown_garage = ~np.isin(vehicle_garages, garages_t[:, 0].astype(np.int64))
+    for v_id, g_id in zip(vehicle_ids[unknown_garage].tolist(), vehicle_garages[unknown_garage].tolist()):
+        errors.append(f"Véhicule {v_id} utilise garage inexistant {g_id}")
     
     # Vérification produits initiaux valides
-    product_ids = set(range(1, nb_p + 1))
-    for v in vehicles:
-        if int(v[3]) not in product_ids:
-            errors.append(f"Véhicule {int(v[0])} a produit initial invalide {int(v[3])}")
+    initial_products = vehicles_t[:, 3].astype(np.int64)
+    invalid_product = (initial_products < 1) | (initial_products > nb_p)
+    for v_id, p_id in zip(vehicle_ids[invalid_product].tolist(), initial_products[invalid_product].tolist()):
+        errors.append(f"Véhicule {v_id} a produit initial invalide {p_id}")
     
     # Vérification diagonale matrice de transition = 0
-    diag = np.diag(transition_costs)
-    if not np.allclose(diag, 0):
+    # Le générateur écrit des zéros exacts : une comparaison stricte suffit
+    if np.any(np.diagonal(transition_costs) != 0.0):
         errors.append("Diagonale de la matrice de transition non nulle")
     
     # Vérification faisabilité stocks >= demandes
-    total_demand = np.zeros(nb_p)
-    for s in stations:
-        total_demand += np.array(s[3:])
+    total_demand = stations_t[:, 3:].sum(axis=0)
+    total_stock = depots_t[:, 3:].sum(axis=0)
     
-    total_stock = np.zeros(nb_p)
-    for d in depots:
-        total_stock += np.array(d[3:])
-    
-    for p in range(nb_p):
-        if total_stock[p] < total_demand[p]:
-            errors.append(f"Produit {p+1}: Stock ({total_stock[p]:.0f}) < Demande ({total_demand[p]:.0f})")
+    for p in np.flatnonzero(total_stock < total_demand).tolist():
+        errors.append(f"Produit {p+1}: Stock ({total_stock[p]:.0f}) < Demande ({total_demand[p]:.0f})")
     
     # Vérification capacités positives
-    if not np.all(vehicles[:, 1] > 0):
+    if (vehicles_t[:, 1] <= 0).any():
         errors.append("Capacités de véhicules non positives détectées")
     
     # Vérification: chaque station doit avoir au moins une demande non-nulle
-    for s in stations:
-        station_id = int(s[0])
-        demands = s[3:]
-        if not any(d > 0 for d in demands):
-            errors.append(f"Station {station_id}: Aucune demande pour aucun produit")
+    station_ids = stations_t[:, 0].astype(np.int64)
+    station_demands = stations_t[:, 3:]
+    for station_id in station_ids[~(station_demands > 0).any(axis=1)].tolist():
+        errors.append(f"Station {station_id}: Aucune demande pour aucun produit")
     
     # Vérification demande individuelle <= capacité totale flotte (Split Delivery)
     # Un camion ne peut desservir une station qu'une fois pour un produit,
     # mais plusieurs camions peuvent desservir la même station pour le même produit
-    total_capacity = np.sum(vehicles[:, 1])
-    for s in stations:
-        station_id = int(s[0])
-        for p_idx, demand in enumerate(s[3:]):
-            if demand > total_capacity:
-                errors.append(f"Station {station_id}, Produit {p_idx+1}: Demande ({demand:.0f}) > Capacité totale flotte ({total_capacity:.0f})")
+    total_capacity = np.sum(vehicles_t[:, 1])
+    for row, p_idx in np.argwhere(station_demands > total_capacity).tolist():
+        errors.append(f"Station {station_ids[row]}, Produit {p_idx+1}: Demande ({station_demands[row, p_idx]:.0f}) > Capacité totale flotte ({total_capacity:.0f})")
     
     # Vérification chevauchement géographique (distance minimale)
     min_distance = 0.1  # Distance minimale entre deux points
-    all_points = []
-    for d in depots:
-        all_points.append(('Dépôt', int(d[0]), d[1], d[2]))
-    for g in garages:
-        all_points.append(('Garage', int(g[0]), g[1], g[2]))
-    for s in stations:
-        all_points.append(('Station', int(s[0]), s[1], s[2]))
-    
-    for i in range(len(all_points)):
-        for j in range(i + 1, len(all_points)):
-            p1, p2 = all_points[i], all_points[j]
-            dist = np.sqrt((p1[2] - p2[2])**2 + (p1[3] - p2[3])**2)
-            if dist < min_distance:
-                warnings.append(f"Chevauchement: {p1[0]} {p1[1]} et {p2[0]} {p2[1]} (dist={dist:.2f})")
+    kinds = ['Dépôt'] * len(depots_t) + ['Garage'] * len(garages_t) + ['Station'] * len(stations_t)
+    point_ids = np.concatenate([depots_t[:, 0], garages_t[:, 0], stations_t[:, 0]]).astype(np.int64).tolist()
+    points = np.concatenate([depots_t[:, 1:3], garages_t[:, 1:3], stations_t[:, 1:3]])
+    
+    # Distances des paires i < j dans l'ordre (i, j) croissant, par blocs de lignes i :
+    # chaque bloc est comparé aux points suivants, la mémoire reste bornée par _OVERLAP_BLOCK_SIZE
+    n_points = len(points)
+    block = max(1, _OVERLAP_BLOCK_SIZE // max(n_points, 1))
+    for start in range(0, n_points, block):
+        stop = min(start + block, n_points)
+        others = points[start + 1:]
+        dx = points[start:stop, 0, None] - others[:, 0]
+        dy = points[start:stop, 1, None] - others[:, 1]
+        dists = np.sqrt(dx**2 + dy**2)
+        # Colonne c <-> point start + 1 + c : seules les colonnes c >= r (j > i) sont des paires à tester
+        upper = np.arange(others.shape[0]) >= np.arange(stop - start)[:, None]
+        for r, c in zip(*np.nonzero((dists < min_distance) & upper)):
+            i, j = start + r, start + 1 + c
+            warnings.append(f"Chevauchement: {kinds[i]} {point_ids[i]} et {kinds[j]} {point_ids[j]} (dist={dists[r, c]:.2f})")
     
     return errors, warnings
 
@@ -197,7 +245,7 @@ def generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, n
         max_transition_cost: Coût max changement produit
         min_demand: Demande minimale par station/produit
         max_demand: Demande maximale par station/produit
-        seed: Graine aléatoire pour reproductibilité
+        seed: Graine aléatoire pour reproductibilité (ou np.random.Generator à utiliser tel quel)
         force_overwrite: Si True, écrase le fichier existant sans confirmation
         output_dir: Dossier de sortie personnalisé (optionnel, défaut: ../../data/instances)
         silent: Si True, supprime tous les prints (mode batch)
@@ -205,6 +253,23 @@ def generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, n
     Returns:
         str: Chemin du fichier généré, ou None si erreur
     """
+    return _generer_instance(id_inst, nb_v, nb_d, nb_g, nb_s, nb_p, max_coord, min_capacite, max_capacite,
+                             min_transition_cost, max_transition_cost, min_demand, max_demand,
+                             seed, force_overwrite, output_dir, silent)
+
+
+def _generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, nb_p=None,
+                      max_coord=100.0, min_capacite=10000, max_capacite=25000,
+                      min_transition_cost=10.0, max_transition_cost=80.0,
+                      min_demand=500, max_demand=5000,
+                      seed=None, force_overwrite=False, output_dir=None, silent=False, known_ids=None):
+    """
+    Corps de generer_instance.
+    
+    known_ids (optionnel) associe à chaque dossier de sortie l'ensemble de ses IDs, partagé entre les
+    instances d'un même lot : le dossier n'est alors parcouru qu'une fois, chaque nouvel ID y est ajouté
+    et le cache de get_existing_instance_ids est laissé à l'appelant.
+    """
     # Mode interactif si paramètres manquants
     interactive = any(p is None for p in [id_inst, nb_v, nb_d, nb_g, nb_s, nb_p])
     
@@ -226,10 +291,9 @@ def generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, n
         log(f"--- Génération instance MPVRP-CC ---")
         log(f"Paramètres: id={id_inst}, v={nb_v}, d={nb_d}, g={nb_g}, s={nb_s}, p={nb_p}")
     
-    # Seed pour reproductibilité
+    # Seed pour reproductibilité (générateur local : l'état global de random/np.random n'est pas touché)
+    rng = np.random.default_rng(seed)
     if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
         log(f"Seed: {seed}")
     
     # Nom du fichier selon la nomenclature demandée
@@ -239,8 +303,7 @@ def generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, n
     if output_dir is not None:
         instances_dir = output_dir
     else:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        instances_dir = os.path.join(script_dir, "../../data/instances")
+        instances_dir = DEFAULT_INSTANCES_DIR
     
     # Créer le dossier instances s'il n'existe pas
     if not os.path.exists(instances_dir):
@@ -249,7 +312,12 @@ def generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, n
     filepath = os.path.join(instances_dir, filename)
     
     # Récupérer les IDs existants
-    existing_ids = get_existing_instance_ids(instances_dir)
+    if known_ids is None:
+        existing_ids = get_existing_instance_ids(instances_dir)
+    else:
+        existing_ids = known_ids.get(instances_dir)
+        if existing_ids is None:
+            existing_ids = known_ids[instances_dir] = get_existing_instance_ids(instances_dir)
     
     # Vérification ID unique (indépendamment du nom de fichier complet)
     if id_inst in existing_ids and not force_overwrite:
@@ -295,71 +363,48 @@ def generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, n
     params = np.array([nb_p, nb_d, nb_g, nb_s, nb_v])
     
     # 2. Matrice de coûts de transition (NbProduits x NbProduits)
-    transition_costs = np.zeros((nb_p, nb_p))
-    for i in range(nb_p):
-        for j in range(nb_p):
-            if i == j:
-                transition_costs[i, j] = 0.0
-            else:
-                transition_costs[i, j] = round(random.uniform(min_transition_cost, max_transition_cost), 1)
+    transition_costs = np.round(rng.uniform(min_transition_cost, max_transition_cost, (nb_p, nb_p)), 1)
+    np.fill_diagonal(transition_costs, 0.0)
     
     # 3. Véhicules (NbVehicules x 4: ID, capacity, garage_id, product_init)
-    vehicles = []
-    for i in range(1, nb_v + 1):
-        capacity = random.randint(min_capacite, max_capacite)  # Capacités variables
-        garage_id = random.randint(1, nb_g)
-        product_init = random.randint(1, nb_p)
-        vehicles.append([i, capacity, garage_id, product_init])
-    vehicles = np.array(vehicles)
+    vehicles = np.column_stack([
+        np.arange(1, nb_v + 1),
+        rng.integers(min_capacite, max_capacite + 1, nb_v),  # Capacités variables
+        rng.integers(1, nb_g + 1, nb_v),
+        rng.integers(1, nb_p + 1, nb_v),
+    ])
     
     # 4. Stations d'abord pour calculer les demandes totales (NbStations x (3 + NbProduits))
     # Chaque station DOIT avoir au moins une demande non-nulle pour au moins un produit
-    stations = []
-    total_demands = np.zeros(nb_p)  # Somme des demandes par produit
-    for i in range(1, nb_s + 1):
-        x = round(random.uniform(0, max_coord), 1)
-        y = round(random.uniform(0, max_coord), 1)
-        
-        # Générer les demandes avec garantie qu'au moins une est non-nulle
-        demands = [0] * nb_p
-        has_demand = False
-        
-        for _ in range(nb_p):  # Tentative d'assigner au moins une demande
-            demands = [random.choice([0, random.randint(min_demand, max_demand)]) for _ in range(nb_p)]
-            if any(d > 0 for d in demands):
-                has_demand = True
-                break
-        
-        # Si aucune demande n'a été générée, en assigner une aléatoire à un produit
-        if not has_demand:
-            product_idx = random.randint(0, nb_p - 1)
-            demands[product_idx] = random.randint(min_demand, max_demand)
-        
-        stations.append([i, x, y] + demands)
-        total_demands += np.array(demands)
-    stations = np.array(stations)
+    station_coords = np.round(rng.uniform(0, max_coord, (nb_s, 2)), 1)
+    
+    # Chaque demande vaut 0 ou un tirage dans [min_demand, max_demand] (une chance sur deux)
+    def draw_demands(n):
+        return rng.integers(min_demand, max_demand + 1, (n, nb_p)) * rng.integers(0, 2, (n, nb_p))
+    
+    demands = draw_demands(nb_s)
+    for _ in range(nb_p - 1):  # Nouvelles tentatives pour les stations sans aucune demande
+        empty = ~demands.any(axis=1)
+        if not empty.any():
+            break
+        demands[empty] = draw_demands(int(empty.sum()))
+    
+    # Si aucune demande n'a été générée, en assigner une aléatoire à un produit
+    empty = np.flatnonzero(~demands.any(axis=1))
+    demands[empty, rng.integers(0, nb_p, empty.size)] = rng.integers(min_demand, max_demand + 1, empty.size)
+    
+    stations = np.column_stack([np.arange(1, nb_s + 1), station_coords, demands]).astype(float)
+    total_demands = demands.sum(axis=0)  # Somme des demandes par produit
     
     # 5. Dépôts avec stocks garantissant la faisabilité (NbDepots x (3 + NbProduits))
-    depots = []
-    for i in range(1, nb_d + 1):
-        x = round(random.uniform(0, max_coord), 1)
-        y = round(random.uniform(0, max_coord), 1)
-        # Distribuer les stocks de manière à garantir la faisabilité
-        stocks = []
-        for p in range(nb_p):
-            # Chaque dépôt fournit au moins sa part de la demande totale + une marge
-            min_stock = int(total_demands[p] / nb_d) + random.randint(1000, 5000)
-            stocks.append(min_stock)
-        depots.append([i, x, y] + stocks)
-    depots = np.array(depots)
+    depot_coords = np.round(rng.uniform(0, max_coord, (nb_d, 2)), 1)
+    # Chaque dépôt fournit au moins sa part de la demande totale + une marge
+    stocks = (total_demands / nb_d).astype(int) + rng.integers(1000, 5001, (nb_d, nb_p))
+    depots = np.column_stack([np.arange(1, nb_d + 1), depot_coords, stocks]).astype(float)
     
     # 6. Garages (NbGarages x 3)
-    garages = []
-    for i in range(1, nb_g + 1):
-        x = round(random.uniform(0, max_coord), 1)
-        y = round(random.uniform(0, max_coord), 1)
-        garages.append([i, x, y])
-    garages = np.array(garages)
+    garage_coords = np.round(rng.uniform(0, max_coord, (nb_g, 2)), 1)
+    garages = np.column_stack([np.arange(1, nb_g + 1), garage_coords])
     
     # 7. Validation avant écriture
     log("\n🔍 Validation de l'instance...")
@@ -383,27 +428,80 @@ def generer_instance(id_inst=None, nb_v=None, nb_d=None, nb_g=None, nb_s=None, n
     instance_uuid = str(uuid.uuid4())
     log(f"🔑 UUID généré : {instance_uuid}")
     
-    # 9. Écriture du fichier avec les tableaux numpy
-    with open(filepath, 'w') as f:
-        # Écrire l'UUID en commentaire
-        f.write(f"# {instance_uuid}\n")
-        
-        np.savetxt(f, params.reshape(1, -1), fmt='%d', delimiter='\t')
-        
-        np.savetxt(f, transition_costs, fmt='%.1f', delimiter='\t')
-        
-        np.savetxt(f, vehicles, fmt='%d', delimiter='\t')
-        
-        np.savetxt(f, depots, fmt='%g', delimiter='\t')
-        
-        np.savetxt(f, garages, fmt='%g', delimiter='\t')
-        
-        np.savetxt(f, stations, fmt='%g', delimiter='\t')
+    # 9. Écriture du fichier : tout le contenu est formaté en mémoire puis écrit en une fois
+    content = "".join([
+        f"# {instance_uuid}\n",  # UUID en commentaire
+        _format_block(params.reshape(1, -1), '%d'),
+        _format_block(transition_costs, '%.1f'),
+        _format_block(vehicles, '%d'),
+        _format_block(depots, '%g'),
+        _format_block(garages, '%g'),
+        _format_block(stations, '%g'),
+    ])
+    # Écriture atomique : un fichier partiel ne peut jamais porter le nom d'une instance
+    tmp_path = filepath + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # Le dossier vient de changer : ajouter le nouvel ID à l'entrée du cache avec la nouvelle date
+    # de modification, plutôt que de forcer un nouveau parcours au prochain appel
+    if known_ids is None:
+        _existing_ids_cache[instances_dir] = (os.stat(instances_dir).st_mtime_ns, frozenset(existing_ids | {id_inst}))
+    else:
+        existing_ids.add(id_inst)
 
     log(f"\n✅ Succès ! Fichier généré : {filepath}")
     return filepath
 
 
+_BATCH_REQUIRED_KEYS = ("id_inst", "nb_v", "nb_d", "nb_g", "nb_s", "nb_p")
+
+
+def generer_instances_batch(configs, force_overwrite=False, output_dir=None, seed=None):
+    """
+    Génère plusieurs instances à la suite, sans interaction ni affichage.
+    
+    Toutes les configurations sont contrôlées avant la première génération, pour ne jamais
+    basculer en mode interactif au milieu d'un lot. Chaque dossier de sortie n'est parcouru
+    qu'une fois pour tout le lot.
+    
+    Args:
+        configs: Liste de dictionnaires de paramètres de generer_instance
+                 (id_inst, nb_v, nb_d, nb_g, nb_s, nb_p obligatoires ; seed, max_coord, ... optionnels)
+        force_overwrite: Valeur par défaut de force_overwrite pour chaque instance
+        output_dir: Dossier de sortie par défaut (optionnel, défaut: ../../data/instances)
+        seed: Graine du générateur partagé par les instances sans seed propre (reproductibilité du lot)
+    
+    Returns:
+        list: Chemin de chaque fichier généré, ou None si l'instance correspondante n'a pas été générée
+    """
+    for config in configs:
+        missing = [key for key in _BATCH_REQUIRED_KEYS if config.get(key) is None]
+        if missing:
+            raise ValueError(f"Paramètres manquants pour l'instance {config.get('id_inst')}: {missing}")
+    
+    # Un seul générateur pour tout le lot : np.random.default_rng(rng) renvoie rng lui-même
+    rng = np.random.default_rng(seed)
+    known_ids = {}
+    paths = []
+    try:
+        for config in configs:
+            params = {"force_overwrite": force_overwrite, "output_dir": output_dir, **config, "silent": True}
+            if params.get("seed") is None:
+                params["seed"] = rng
+            paths.append(_generer_instance(**params, known_ids=known_ids))
+    finally:
+        # Un seul enregistrement dans le cache par dossier, à la fin du lot
+        for instances_dir, ids in known_ids.items():
+            _existing_ids_cache[instances_dir] = (os.stat(instances_dir).st_mtime_ns, frozenset(ids))
+    return paths
+
+
 if __name__ == "__main__":
     args = parse_args()
     
@@ -1,19 +1,29 @@
 import os
 import sys
-import re
 
 import numpy as np
 
 class InstanceVerificator:
-    def __init__(self, filepath):
+    # UUID 8-4-4-4-12 : tirets aux positions 8, 13, 18 et 23, chiffres hexadécimaux ailleurs
+    _UUID_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+    _UUID_DASH_POSITIONS = (8, 13, 18, 23)
+    # Nombre maximal de distances calculées à la fois par check_geographic_overlap
+    _OVERLAP_BLOCK_SIZE = 1 << 20
+    
+    def __init__(self, filepath, verbose=True):
         self.filepath = filepath
+        self.verbose = verbose
+        self.report = []  # messages de vérification, conservés même en mode silencieux
         self.errors = []
         self.warnings = []
         self.data = {}
+        self._stats = None
+        self._int_columns = {}
+        self._fatal = False
         
     def verify(self):
         """Effectue toutes les vérifications"""
-        print(f"Vérification de l'instance : {os.path.basename(self.filepath)}\n")
+        self._log(f"Vérification de l'instance : {os.path.basename(self.filepath)}\n")
         
         # 1. Vérifications structurelles
         if not self.check_file_exists():
@@ -22,35 +32,34 @@ class InstanceVerificator:
         if not self.load_data():
             return False
         
-        # 2. Vérifications minimales
-        self.check_minimum_elements()
-        
-        # 3. Vérifications des IDs uniques
-        self.check_unique_ids()
-        
-        # 4. Vérifications de validité
-        self.check_validity()
-        
-        # 5. Vérification Demande ≤ Capacité max
-        self.check_capacity_demand()
-        
-        # 6. Vérification chevauchement géographique
-        self.check_geographic_overlap()
-        
-        # 7. Vérification inégalité triangulaire (matrice de transition)
-        self.check_triangle_inequality()
-        
-        # 8. Vérifications de faisabilité
-        self.check_feasibility()
-        
-        # 9. Vérifications géométriques
-        self.check_geometry()
+        # 2 à 9 : vérifications, interrompues dès qu'une erreur fatale (structure incohérente)
+        # rendrait les suivantes sans objet
+        checks = [
+            self.check_minimum_elements,      # 2. Vérifications minimales
+            self.check_unique_ids,            # 3. Vérifications des IDs uniques
+            self.check_validity,              # 4. Vérifications de validité
+            self.check_capacity_demand,       # 5. Vérification Demande ≤ Capacité max
+            self.check_geographic_overlap,    # 6. Vérification chevauchement géographique
+            self.check_triangle_inequality,   # 7. Vérification inégalité triangulaire (matrice de transition)
+            self.check_feasibility,           # 8. Vérifications de faisabilité
+            self.check_geometry,              # 9. Vérifications géométriques
+        ]
+        for check in checks:
+            check()
+            if self._fatal:
+                break
         
         # Afficher le rapport
         self.print_report()
         
         return len(self.errors) == 0
     
+    def _log(self, message):
+        """Conserve un message dans self.report et ne l'affiche qu'en mode verbeux"""
+        self.report.append(message)
+        if self.verbose:
+            print(message)
+    
     def check_file_exists(self):
         """Vérifie que le fichier existe"""
         if not os.path.exists(self.filepath):
@@ -60,22 +69,25 @@ class InstanceVerificator:
     
     def load_data(self):
         """Charge les données du fichier .dat"""
+        self._stats = None
+        self._int_columns = {}
         try:
             with open(self.filepath, 'r') as f:
-                all_lines = [line.strip() for line in f.readlines()]
+                content = f.read()
             
-            # Extraire l'UUID si présent (première ligne commençant par #)
+            # Une seule passe : UUID (première ligne commentée qui en contient un),
+            # puis filtrage des commentaires et lignes vides
             self.data['uuid'] = None
-            uuid_pattern = re.compile(r'^#\s*([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$', re.IGNORECASE)
-            for line in all_lines:
+            lines = []
+            for line in content.split('\n'):
+                line = line.strip()
+                if not line:
+                    continue
                 if line.startswith('#'):
-                    match = uuid_pattern.match(line)
-                    if match:
-                        self.data['uuid'] = match.group(1)
-                        break
-            
-            # Filtrer les commentaires et lignes vides
-            lines = [line for line in all_lines if line and not line.startswith('#')]
+                    if self.data['uuid'] is None:
+                        self.data['uuid'] = self._extract_uuid(line)
+                    continue
+                lines.append(line)
             
             if len(lines) < 6:
                 self.errors.append("❌ Fichier mal formaté : pas assez de sections")
@@ -96,7 +108,7 @@ class InstanceVerificator:
                 return False
             
             # Parsing - Ordre: nb_p, nb_d, nb_g, nb_s, nb_v
-            params = np.array([int(x) for x in lines[0].split()])
+            params = np.array(first_line_params)
             nb_p, nb_d, nb_g, nb_s, nb_v = params
             
             self.data['params'] = params
@@ -106,48 +118,104 @@ class InstanceVerificator:
             self.data['nb_s'] = nb_s
             self.data['nb_v'] = nb_v
             
+            # Un appel au parseur C de NumPy par bloc : matrice, véhicules, dépôts, garages, stations
             idx = 1
+            for key, count in (('transition_costs', nb_p), ('vehicles', nb_v), ('depots', nb_d),
+                               ('garages', nb_g), ('stations', nb_s)):
+                count = max(count, 0)
+                self.data[key] = self._parse_block(lines[idx:idx + count])
+                idx += count
             
-            # Matrice de transition
-            transition_costs = []
-            for i in range(nb_p):
-                transition_costs.append([float(x) for x in lines[idx].split()])
-                idx += 1
-            self.data['transition_costs'] = np.array(transition_costs)
+            # Identifiants et références (garage, produit initial) : un NaN ou Inf ne peut pas être
+            # converti en entier et produirait des IDs aberrants dans les messages
+            for key, cols in (('vehicles', [0, 2, 3]), ('depots', [0]), ('garages', [0]), ('stations', [0])):
+                block = self.data[key]
+                if len(block) and not np.isfinite(block[:, cols]).all():
+                    raise ValueError(f"identifiant ou référence non fini (NaN ou Inf) dans le bloc {key}")
             
-            # Véhicules
-            vehicles = []
-            for i in range(nb_v):
-                vehicles.append([float(x) for x in lines[idx].split()])
-                idx += 1
-            self.data['vehicles'] = np.array(vehicles)
-            
-            # Dépôts
-            depots = []
-            for i in range(nb_d):
-                depots.append([float(x) for x in lines[idx].split()])
-                idx += 1
-            self.data['depots'] = np.array(depots)
-            
-            # Garages
-            garages = []
-            for i in range(nb_g):
-                garages.append([float(x) for x in lines[idx].split()])
-                idx += 1
-            self.data['garages'] = np.array(garages)
-            
-            # Stations
-            stations = []
-            for i in range(nb_s):
-                stations.append([float(x) for x in lines[idx].split()])
-                idx += 1
-            self.data['stations'] = np.array(stations)
+            # Vues (sans copie) sur les colonnes produits : stocks des dépôts, demandes des stations
+            for key, block_key in (('stocks', 'depots'), ('demands', 'stations')):
+                block = self.data[block_key]
+                self.data[key] = block[:, 3:] if len(block) else np.zeros((0, nb_p))
             
             return True
         except Exception as e:
             self.errors.append(f"Erreur lors du chargement : {str(e)}")
             return False
     
+    @classmethod
+    def _extract_uuid(cls, line):
+        """Retourne l'UUID d'une ligne '# <uuid>', ou None si la ligne n'en porte pas"""
+        candidate = line[1:].lstrip()
+        if len(candidate) != 36:
+            return None
+        if any(candidate[i] != '-' for i in cls._UUID_DASH_POSITIONS):
+            return None
+        digits = candidate.replace('-', '')
+        if len(digits) != 32 or not cls._UUID_HEX_DIGITS.issuperset(digits):
+            return None
+        return candidate
+    
+    @staticmethod
+    def _parse_block(lines):
+        """Convertit un bloc de lignes numériques en tableau 2D (tableau vide si aucune ligne)"""
+        if not lines:
+            return np.array([])
+        return np.loadtxt(lines, comments=None, ndmin=2)
+    
+    def _int_column(self, key, col):
+        """
+        Colonne `col` du bloc `key` convertie en entiers (tableau vide si le bloc est vide).
+        Convertie une seule fois par chargement, puis réutilisée par toutes les vérifications.
+        """
+        column = self._int_columns.get((key, col))
+        if column is None:
+            block = self.data[key]
+            column = block[:, col].astype(np.int64) if len(block) else np.zeros(0, dtype=np.int64)
+            self._int_columns[(key, col)] = column
+        return column
+    
+    def _vectorized_pass(self):
+        """
+        Calcule en un passage par bloc les agrégats partagés par check_validity,
+        check_feasibility et check_geometry ; le résultat est mis en cache dans self._stats
+        jusqu'au prochain load_data. Les blocs vides ne contribuent à aucun agrégat.
+        """
+        if self._stats is not None:
+            return self._stats
+        
+        nb_p = self.data['nb_p']
+        stats = {
+            'finite': True,
+            'coords_non_negative': True,
+            'stocks_non_negative': True,
+            'capacities_positive': True,
+            'stock_totals': np.zeros(nb_p),
+            'demand_totals': np.zeros(nb_p),
+            'station_demands': np.zeros(0),
+        }
+        
+        for key in ('depots', 'garages', 'stations'):
+            block = self.data[key]
+            if not len(block):
+                continue
+            block = np.ascontiguousarray(block)
+            stats['finite'] = stats['finite'] and bool(np.isfinite(block).all())
+            stats['coords_non_negative'] = stats['coords_non_negative'] and bool((block[:, 1:3] >= 0).all())
+            if key == 'depots':
+                stats['stocks_non_negative'] = bool((block[:, 2:] >= 0).all())
+                stats['stock_totals'] += self.data['stocks'].sum(axis=0)
+            elif key == 'stations':
+                stats['station_demands'] = self.data['demands'].sum(axis=1)
+                stats['demand_totals'] += self.data['demands'].sum(axis=0)
+        
+        vehicles = self.data['vehicles']
+        if len(vehicles):
+            stats['capacities_positive'] = bool((vehicles[:, 1] > 0).all())
+        
+        self._stats = stats
+        return stats
+    
     def check_minimum_elements(self):
         """Vérifie les éléments minimums"""
         checks = [
@@ -161,12 +229,13 @@ class InstanceVerificator:
         for key, min_val, name in checks:
             if self.data[key] < min_val:
                 self.errors.append(f"Au moins 1 {name} requis, trouvé : {self.data[key]}")
+                self._fatal = True
             else:
-                print(f"✓ {name} : {self.data[key]}")
+                self._log(f"✓ {name} : {self.data[key]}")
     
     def check_unique_ids(self):
         """Vérifie que les IDs sont uniques ET contigus [1, n] pour chaque type d'entité"""
-        print("\n🔢 Vérifications des IDs (unicité et contiguïté) :")
+        self._log("\n🔢 Vérifications des IDs (unicité et contiguïté) :")
         
         entities = [
             ('vehicles', 'Véhicules', self.data['nb_v']),
@@ -176,49 +245,47 @@ class InstanceVerificator:
         ]
         
         for key, name, expected_count in entities:
-            ids = [int(row[0]) for row in self.data[key]]
-            unique_ids = set(ids)
-            expected_ids = set(range(1, expected_count + 1))
+            ids = self._int_column(key, 0)
+            unique_ids, counts = np.unique(ids, return_counts=True)
+            expected_ids = np.arange(1, expected_count + 1)
             
             # Vérifier unicité
             if len(ids) != len(unique_ids):
-                duplicates = [id for id in ids if ids.count(id) > 1]
+                duplicates = ids[np.isin(ids, unique_ids[counts > 1])].tolist()
                 self.errors.append(f"❌ IDs dupliqués pour {name} : {set(duplicates)}")
             # Vérifier contiguïté [1, n]
-            elif unique_ids != expected_ids:
-                missing = expected_ids - unique_ids
-                extra = unique_ids - expected_ids
-                if missing:
-                    self.errors.append(f"❌ IDs manquants pour {name}: {sorted(missing)}")
-                if extra:
-                    self.errors.append(f"❌ IDs hors plage pour {name}: {sorted(extra)} (attendu: 1-{expected_count})")
+            elif not np.array_equal(unique_ids, expected_ids):
+                missing = np.setdiff1d(expected_ids, unique_ids)
+                extra = np.setdiff1d(unique_ids, expected_ids)
+                if len(missing):
+                    self.errors.append(f"❌ IDs manquants pour {name}: {missing.tolist()}")
+                if len(extra):
+                    self.errors.append(f"❌ IDs hors plage pour {name}: {extra.tolist()} (attendu: 1-{expected_count})")
             else:
-                print(f"✓ IDs {name} valides [1-{expected_count}]")
+                self._log(f"✓ IDs {name} valides [1-{expected_count}]")
     
     def check_validity(self):
         """Vérifie la validité des données"""
-        print("\n✅ Vérifications de validité :")
-        
-        # Garages utilisés existent
-        vehicles = self.data['vehicles']
-        garage_ids = set(int(v[2]) for v in vehicles)
-        valid_garage_ids = set(int(g[0]) for g in self.data['garages'])
+        self._log("\n✅ Vérifications de validité :")
         
-        for gid in garage_ids:
-            if gid not in valid_garage_ids:
-                self.errors.append(f"❌ Garage {gid} utilisé par véhicule mais n'existe pas")
+        # Garages utilisés existent (chaque garage inconnu signalé une fois, par ID croissant)
+        vehicle_garages = self._int_column('vehicles', 2)
+        unknown_garages = np.unique(vehicle_garages[~np.isin(vehicle_garages, self._int_column('garages', 0))])
+        for gid in unknown_garages.tolist():
+            self.errors.append(f"❌ Garage {gid} utilisé par véhicule mais n'existe pas")
         
         # Produits initiaux valides
-        product_ids = set(range(1, self.data['nb_p'] + 1))
-        for v in vehicles:
-            if int(v[3]) not in product_ids:
-                self.errors.append(f"❌ Produit initial {int(v[3])} invalide pour véhicule {int(v[0])}")
+        initial_products = self._int_column('vehicles', 3)
+        invalid = (initial_products < 1) | (initial_products > self.data['nb_p'])
+        for product, vehicle_id in zip(initial_products[invalid].tolist(), self._int_column('vehicles', 0)[invalid].tolist()):
+            self.errors.append(f"❌ Produit initial {product} invalide pour véhicule {vehicle_id}")
         
         # Matrice de transition carrée
         if self.data['transition_costs'].shape != (self.data['nb_p'], self.data['nb_p']):
             self.errors.append(f"❌ Matrice de transition mal dimensionnée : {self.data['transition_costs'].shape} au lieu de ({self.data['nb_p']}, {self.data['nb_p']})")
+            self._fatal = True
         else:
-            print("✓ Matrice de transition cohérente")
+            self._log("✓ Matrice de transition cohérente")
         
         # Diagonale de la matrice de transition doit être 0
         diag = np.diag(self.data['transition_costs'])
@@ -226,28 +293,20 @@ class InstanceVerificator:
             non_zero_diag = [(i+1, diag[i]) for i in range(len(diag)) if diag[i] != 0]
             self.errors.append(f"❌ Diagonale de la matrice de transition non nulle : {non_zero_diag}")
         else:
-            print("✓ Diagonale de la matrice de transition = 0")
+            self._log("✓ Diagonale de la matrice de transition = 0")
         
         # Demandes > 0 pour au moins une station
-        stations = self.data['stations']
-        total_demand_exists = False
-        stations_without_demand = []
-        for s in stations:
-            demands = s[3:]
-            if np.sum(demands) > 0:
-                total_demand_exists = True
-            else:
-                stations_without_demand.append(int(s[0]))
+        stats = self._vectorized_pass()
+        stations_without_demand = self._int_column('stations', 0)[~(stats['station_demands'] > 0)].tolist()
         
         if stations_without_demand:
             self.errors.append(f"❌ Station(s) sans aucune demande : {stations_without_demand}")
         else:
-            print("✓ Toutes les stations ont au moins une demande")
+            self._log("✓ Toutes les stations ont au moins une demande")
         
         # Stocks >= 0
-        depots = self.data['depots']
-        if np.all(depots[:, 2:] >= 0):
-            print("✓ Stocks non-négatifs")
+        if stats['stocks_non_negative']:
+            self._log("✓ Stocks non-négatifs")
         else:
             self.errors.append("❌ Stocks négatifs détectés")
     
@@ -259,58 +318,76 @@ class InstanceVerificator:
         - Plusieurs camions peuvent desservir la même station pour le même produit
         - Donc : demande(s, p) <= SUM(capacités de tous les camions)
         """
-        print("\n🚗 Vérification capacité (Split Delivery) :")
+        self._log("\n🚗 Vérification capacité (Split Delivery) :")
         
         vehicles = self.data['vehicles']
         stations = self.data['stations']
         total_capacity = np.sum(vehicles[:, 1])
         
-        violations = []
-        for s in stations:
-            station_id = int(s[0])
-            for p_idx, demand in enumerate(s[3:]):
-                if demand < 0:
-                    violations.append(f"Station {station_id}, Produit {p_idx+1}: Demande négative ({demand:.0f})")
-                elif demand > total_capacity:
-                    violations.append(f"Station {station_id}, Produit {p_idx+1}: {demand:.0f} > {total_capacity:.0f} (capacité totale)")
-        
-        if violations:
-            self.errors.append(f"❌ {len(violations)} demande(s) dépassent la capacité totale flotte ({total_capacity:.0f}):")
-            for v in violations[:5]:
-                self.errors.append(f"   - {v}")
-            if len(violations) > 5:
-                self.errors.append(f"   ... et {len(violations) - 5} autre(s)")
+        s_idx = p_idx = np.zeros(0, dtype=np.int64)
+        if len(stations):
+            # Une comparaison sur tout le bloc (nb_s, nb_p), parcouru station par station
+            demands = self.data['demands']
+            negative = demands < 0
+            s_idx, p_idx = np.nonzero(negative | (demands > total_capacity))
+        
+        if len(s_idx):
+            station_ids = self._int_column('stations', 0).tolist()
+            self.errors.append(f"❌ {len(s_idx)} demande(s) dépassent la capacité totale flotte ({total_capacity:.0f}):")
+            # Seuls les 5 premiers cas sont détaillés
+            for si, pi in zip(s_idx[:5].tolist(), p_idx[:5].tolist()):
+                station_id = station_ids[si]
+                demand = demands[si, pi]
+                if negative[si, pi]:
+                    self.errors.append(f"   - Station {station_id}, Produit {pi+1}: Demande négative ({demand:.0f})")
+                else:
+                    self.errors.append(f"   - Station {station_id}, Produit {pi+1}: {demand:.0f} > {total_capacity:.0f} (capacité totale)")
+            if len(s_idx) > 5:
+                self.errors.append(f"   ... et {len(s_idx) - 5} autre(s)")
         else:
-            print(f"✓ Toutes les demandes ≤ Capacité totale flotte ({total_capacity:.0f})")
+            self._log(f"✓ Toutes les demandes ≤ Capacité totale flotte ({total_capacity:.0f})")
     
     def check_geographic_overlap(self):
         """Vérifie qu'il n'y a pas de chevauchement géographique"""
-        print("\n📍 Vérification chevauchement géographique :")
+        self._log("\n📍 Vérification chevauchement géographique :")
         
         min_distance = 0.1  # Distance minimale entre deux points
-        all_points = []
-        
-        for d in self.data['depots']:
-            all_points.append(('Dépôt', int(d[0]), d[1], d[2]))
-        for g in self.data['garages']:
-            all_points.append(('Garage', int(g[0]), g[1], g[2]))
-        for s in self.data['stations']:
-            all_points.append(('Station', int(s[0]), s[1], s[2]))
+        labels = []
+        coords = []
+        for key, name in (('depots', 'Dépôt'), ('garages', 'Garage'), ('stations', 'Station')):
+            block = self.data[key]
+            if len(block):
+                labels.extend(f"{name} {entity_id}" for entity_id in self._int_column(key, 0).tolist())
+                coords.append(block[:, 1:3])
         
         overlaps = []
-        for i in range(len(all_points)):
-            for j in range(i + 1, len(all_points)):
-                p1, p2 = all_points[i], all_points[j]
-                dist = np.sqrt((p1[2] - p2[2])**2 + (p1[3] - p2[3])**2)
-                if dist < min_distance:
-                    overlaps.append(f"{p1[0]} {p1[1]} et {p2[0]} {p2[1]} (dist={dist:.3f})")
+        if coords:
+            # Paires (i < j) dans l'ordre de l'ancienne double boucle, par blocs de lignes i comparés
+            # aux points suivants : au plus _OVERLAP_BLOCK_SIZE distances en mémoire à la fois
+            xy = np.vstack(coords)
+            block = max(1, self._OVERLAP_BLOCK_SIZE // len(xy))
+            for start in range(0, len(xy), block):
+                rows = xy[start:start + block]
+                delta = rows[:, None, :] - xy[None, start + 1:, :]
+                squared = delta[..., 0]**2 + delta[..., 1]**2
+                # Colonne c <-> point start + 1 + c : seules les colonnes c >= r (j > i) sont des paires
+                squared[np.arange(squared.shape[1]) < np.arange(len(rows))[:, None]] = np.inf
+                # Pré-filtre sur les carrés (seuil légèrement élargi), puis test exact sur la
+                # racine des seuls candidats pour garder la même frontière qu'avant
+                r_idx, c_idx = np.nonzero(squared < min_distance**2 * (1 + 1e-9))
+                dists = np.sqrt(squared[r_idx, c_idx])
+                close = dists < min_distance
+                overlaps.extend(
+                    f"{labels[start + r]} et {labels[start + 1 + c]} (dist={dist:.3f})"
+                    for r, c, dist in zip(r_idx[close], c_idx[close], dists[close])
+                )
         
         if overlaps:
             self.warnings.append(f"⚠️ {len(overlaps)} chevauchement(s) détecté(s):")
             for o in overlaps:
                 self.warnings.append(f"   - {o}")
         else:
-            print("✓ Pas de chevauchement géographique")
+            self._log("✓ Pas de chevauchement géographique")
     
     def check_triangle_inequality(self):
         """
@@ -323,147 +400,146 @@ class InstanceVerificator:
         - C'est réaliste physiquement (certains nettoyages sont plus complexes)
         - Le solveur pourrait exploiter des "changements intermédiaires"
         """
-        print("\n🔺 Vérification inégalité triangulaire (matrice de transition) :")
+        self._log("\n🔺 Vérification inégalité triangulaire (matrice de transition) :")
         
         transition = self.data['transition_costs']
         nb_p = self.data['nb_p']
         
         if nb_p < 3:
-            print("✓ Moins de 3 produits : vérification non applicable")
+            self._log("✓ Moins de 3 produits : vérification non applicable")
             return
         
-        violations = []
+        transition = transition[:nb_p, :nb_p]
+        
+        # Une passe par produit intermédiaire j, comme l'étape de relaxation de Floyd–Warshall :
+        # indirect[i, k] = Cost(i → j) + Cost(j → k) est comparé au coût direct en O(P²) mémoire.
+        # (Pas de fermeture complète : seuls les détours par un unique intermédiaire sont signalés.)
+        off_diagonal = ~np.eye(nb_p, dtype=bool)
+        found = []
+        for j in range(nb_p):
+            indirect = transition[:, j:j+1] + transition[j:j+1, :]
+            mask = (transition > indirect) & off_diagonal
+            mask[j, :] = False
+            mask[:, j] = False
+            if not mask.any():
+                continue
+            i_idx, k_idx = np.nonzero(mask)
+            found.append((i_idx, k_idx, np.full(len(i_idx), j), indirect[i_idx, k_idx]))
+        
+        # Cas courant d'une matrice métrique : rien à énumérer ni à trier
+        if not found:
+            self._log("✓ Inégalité triangulaire respectée (matrice métrique)")
+            return
         
-        for i in range(nb_p):
-            for k in range(nb_p):
-                if i == k:
-                    continue
-                direct_cost = transition[i, k]
-                
-                for j in range(nb_p):
-                    if j == i or j == k:
-                        continue
-                    indirect_cost = transition[i, j] + transition[j, k]
-                    
-                    if direct_cost > indirect_cost:
-                        violations.append({
-                            'from': i + 1,
-                            'to': k + 1,
-                            'via': j + 1,
-                            'direct': direct_cost,
-                            'indirect': indirect_cost,
-                            'savings': direct_cost - indirect_cost
-                        })
-        
-        if violations:
-            # Trier par économie décroissante
-            violations.sort(key=lambda x: x['savings'], reverse=True)
-            
-            self.warnings.append(f"⚠️ Inégalité triangulaire non respectée ({len(violations)} cas) :")
-            self.warnings.append(f"   → Le solveur pourrait utiliser des changements intermédiaires")
-            
-            # Afficher les 5 cas les plus significatifs
-            for v in violations[:5]:
-                self.warnings.append(
-                    f"   - P{v['from']}→P{v['to']} : direct={v['direct']:.1f} > "
-                    f"via P{v['via']} ({v['indirect']:.1f}) | Économie: {v['savings']:.1f}"
-                )
-            
-            if len(violations) > 5:
-                self.warnings.append(f"   ... et {len(violations) - 5} autre(s) cas")
-        else:
-            print("✓ Inégalité triangulaire respectée (matrice métrique)")
+        ii, kk, jj, indirect_costs = (np.concatenate(column) for column in zip(*found))
+        savings = transition[ii, kk] - indirect_costs
+        
+        # Seuls les 5 cas les plus significatifs sont triés : sélection des économies
+        # au moins égales à la 5e plus grande (ex aequo compris), puis tri par économie
+        # décroissante et ordre de parcours (i, k, j)
+        top = np.arange(len(savings))
+        if len(savings) > 5:
+            top = np.flatnonzero(savings >= np.partition(savings, -5)[-5])
+        order = top[np.lexsort((jj[top], kk[top], ii[top], -savings[top]))]
+        violations = [
+            {
+                'from': ii[n] + 1,
+                'to': kk[n] + 1,
+                'via': jj[n] + 1,
+                'direct': transition[ii[n], kk[n]],
+                'indirect': indirect_costs[n],
+                'savings': savings[n]
+            }
+            for n in order[:5]
+        ]
+        
+        self.warnings.append(f"⚠️ Inégalité triangulaire non respectée ({len(savings)} cas) :")
+        self.warnings.append(f"   → Le solveur pourrait utiliser des changements intermédiaires")
+        
+        # Afficher les 5 cas les plus significatifs
+        for v in violations:
+            self.warnings.append(
+                f"   - P{v['from']}→P{v['to']} : direct={v['direct']:.1f} > "
+                f"via P{v['via']} ({v['indirect']:.1f}) | Économie: {v['savings']:.1f}"
+            )
+        
+        if len(savings) > 5:
+            self.warnings.append(f"   ... et {len(savings) - 5} autre(s) cas")
     
     def check_feasibility(self):
         """Vérifie la faisabilité"""
-        print("\n📦 Vérifications de faisabilité :")
-        
-        depots = self.data['depots']
-        stations = self.data['stations']
-        nb_p = self.data['nb_p']
-        
-        # Demande totale par produit
-        total_demand = np.zeros(nb_p)
-        for s in stations:
-            total_demand += s[3:]
+        self._log("\n📦 Vérifications de faisabilité :")
         
-        # Stock total par produit
-        total_stock = np.zeros(nb_p)
-        for d in depots:
-            total_stock += d[3:]
+        # Demande totale et stock total par produit
+        stats = self._vectorized_pass()
+        total_demand = stats['demand_totals']
+        total_stock = stats['stock_totals']
         
-        feasible = True
-        for p in range(nb_p):
-            if total_stock[p] >= total_demand[p]:
-                print(f"✓ Produit {p+1} : Stock {total_stock[p]:.0f} ≥ Demande {total_demand[p]:.0f}")
+        covered = total_stock >= total_demand
+        for p, ok in enumerate(covered.tolist()):
+            if ok:
+                self._log(f"✓ Produit {p+1} : Stock {total_stock[p]:.0f} ≥ Demande {total_demand[p]:.0f}")
             else:
                 self.errors.append(f"❌ Produit {p+1} : Stock {total_stock[p]:.0f} < Demande {total_demand[p]:.0f}")
-                feasible = False
         
-        self.data['feasible'] = feasible
+        self.data['feasible'] = bool(covered.all())
     
     def check_geometry(self):
         """Vérifie les coordonnées géométriques"""
-        print("\n🗺 Vérifications géométriques :")
+        self._log("\n🗺 Vérifications géométriques :")
         
-        # Vérifier NaN/Inf
-        all_data = [self.data['depots'], self.data['garages'], self.data['stations']]
-        for dataset in all_data:
-            if np.any(np.isnan(dataset)) or np.any(np.isinf(dataset)):
-                self.errors.append("❌ NaN ou Inf détectés dans les coordonnées")
-                return
+        stats = self._vectorized_pass()
         
-        print("✓ Pas de NaN ou Inf")
+        # Vérifier NaN/Inf
+        if not stats['finite']:
+            self.errors.append("❌ NaN ou Inf détectés dans les coordonnées")
+            return
         
-        # Vérifier valeurs négatives dans les bonnes colonnes
-        depots = self.data['depots']
-        garages = self.data['garages']
-        stations = self.data['stations']
+        self._log("✓ Pas de NaN ou Inf")
         
         # Coordonnées >= 0
-        if np.all(depots[:, 1:3] >= 0) and np.all(garages[:, 1:3] >= 0) and np.all(stations[:, 1:3] >= 0):
-            print("Coordonnées non-négatives")
+        if stats['coords_non_negative']:
+            self._log("Coordonnées non-négatives")
         else:
             self.warnings.append("Coordonnées négatives détectées")
         
         # Capacités > 0
-        vehicles = self.data['vehicles']
-        if np.all(vehicles[:, 1] > 0):
-            print("✓ Capacités positives")
+        if stats['capacities_positive']:
+            self._log("✓ Capacités positives")
         else:
             self.errors.append("❌ Capacités non-positives détectées")
     
     def print_report(self):
         """Affiche le rapport final"""
-        print("\n" + "="*50)
-        print("📊 RAPPORT DE VÉRIFICATION")
-        print("="*50)
+        self._log("\n" + "="*50)
+        self._log("📊 RAPPORT DE VÉRIFICATION")
+        self._log("="*50)
         
         # Afficher l'UUID si présent
         instance_uuid = self.data.get('uuid')
         if instance_uuid:
-            print(f"\n🔑 UUID : {instance_uuid}")
+            self._log(f"\n🔑 UUID : {instance_uuid}")
         else:
-            print("\n⚠️ UUID : Non trouvé (instance ancienne ou manuelle)")
+            self._log("\n⚠️ UUID : Non trouvé (instance ancienne ou manuelle)")
         
         if self.errors:
-            print(f"\n❌ {len(self.errors)} erreur(s) :")
+            self._log(f"\n❌ {len(self.errors)} erreur(s) :")
             for error in self.errors:
-                print(f"  {error}")
+                self._log(f"  {error}")
         else:
-            print("\n✅ Aucune erreur critique !")
+            self._log("\n✅ Aucune erreur critique !")
         
         if self.warnings:
-            print(f"\n⚠️ {len(self.warnings)} avertissement(s) :")
+            self._log(f"\n⚠️ {len(self.warnings)} avertissement(s) :")
             for warning in self.warnings:
-                print(f"  {warning}")
+                self._log(f"  {warning}")
         
         feasible_status = "✅ FAISABLE" if self.data.get('feasible', False) else "⚠️ À vérifier"
         status = "✅ VALIDE" if len(self.errors) == 0 else "❌ INVALIDE"
         
-        print(f"\nStatut : {status}")
-        print(f"Faisabilité : {feasible_status}")
-        print("="*50 + "\n")
+        self._log(f"\nStatut : {status}")
+        self._log(f"Faisabilité : {feasible_status}")
+        self._log("="*50 + "\n")
 
 
 def main():
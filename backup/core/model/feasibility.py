@@ -1,10 +1,75 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from .utils import solution_node_key
+import numpy as np
+
+from .utils import (
+    solution_node_key, distance_matrix_from_dict, cost_matrix_from_dict, product_matrix_from_dicts, route_arrays,
+    concat_route_arrays,
+    GARAGE, DEPOT, STATION,
+)
 from .schemas import ParsedSolutionDat, Instance
 
 
+# Metrics declared in the solution file and checked against the recalculated ones:
+# (name, tolerance), where a tolerance of None means an exact comparison
+METRIC_CHECKS: Tuple[Tuple[str, Optional[float]], ...] = (
+    ("used_vehicles", None),
+    ("total_changes", None),
+    ("total_switch_cost", 0.2),
+    ("distance_total", 0.2),
+)
+
+
+# Per-node error flags computed by _route_error_flags
+UNKNOWN_DEPOT = 1
+CAPACITY_EXCEEDED = 2
+UNKNOWN_STATION = 4
+GARAGE_IN_MIDDLE = 8
+
+
+def _route_error_flags(kinds: np.ndarray, ids: np.ndarray, qtys: np.ndarray, capacities: np.ndarray,
+                       offsets: np.ndarray, known_depot_ids: np.ndarray, known_station_ids: np.ndarray) -> np.ndarray:
+    """
+    Compute the per-node error flags of all routes in one vectorized pass.
+
+    The routes are concatenated: route k spans [offsets[k], offsets[k+1]) and capacities holds, for each node,
+    the capacity of the vehicle driving that route. Returns a uint8 array with one bit set per failed check
+    (see UNKNOWN_DEPOT and the other flags above), so that messages only need to be built for the few flagged nodes.
+    """
+    is_depot = kinds == DEPOT
+    is_station = kinds == STATION
+    flags = np.zeros(len(kinds), dtype=np.uint8)
+    flags[is_depot & ~np.isin(ids, known_depot_ids)] |= UNKNOWN_DEPOT
+    flags[is_depot & (qtys > capacities + 1e-6)] |= CAPACITY_EXCEEDED
+    flags[is_station & ~np.isin(ids, known_station_ids)] |= UNKNOWN_STATION
+    # Garages are only allowed at the start and end of each route
+    starts, ends = offsets[:-1], offsets[1:]
+    nonempty = ends > starts
+    interior = np.ones(len(kinds), dtype=bool)
+    interior[starts[nonempty]] = False
+    interior[ends[nonempty] - 1] = False
+    flags[interior & (kinds == GARAGE)] |= GARAGE_IN_MIDDLE
+    return flags
+
+
+def _scatter_add(shape: Tuple[int, int], rows: List[np.ndarray], products: List[np.ndarray],
+                 qtys: List[np.ndarray]) -> np.ndarray:
+    """
+    Sum per-vehicle quantities into a (rows x products) matrix with np.add.at.
+
+    Entries whose row is unknown (-1) or whose product falls outside the matrix are dropped:
+    they can never match a demand or a stock.
+    """
+    totals = np.zeros(shape, dtype=np.float64)
+    rows_arr = np.concatenate([np.empty(0, dtype=np.intp)] + rows)
+    products_arr = np.concatenate([np.empty(0, dtype=np.intp)] + products)
+    qtys_arr = np.concatenate([np.empty(0, dtype=np.float64)] + qtys)
+    keep = (rows_arr >= 0) & (products_arr >= 0) & (products_arr < shape[1])
+    np.add.at(totals, (rows_arr[keep], products_arr[keep]), qtys_arr[keep])
+    return totals
+
+
 def verify_solution(instance: Instance, solution: ParsedSolutionDat) -> Tuple[List[str], Dict[str, Any]]:
     """
     Verify the feasibility and consistency of a solution of the MPVRP-CC.
@@ -32,22 +97,87 @@ def verify_solution(instance: Instance, solution: ParsedSolutionDat) -> Tuple[Li
     """
     errors: List[str] = []
 
-    # Create lookup tables for fast access to entities by numeric ID
-    vehicle_by_id = {int(k[1:]): v for k, v in instance.camions.items()}
-    depot_by_id = {int(k[1:]): v for k, v in instance.depots.items()}
-    station_by_id = {int(k[1:]): v for k, v in instance.stations.items()}
-
-    # Accumulators for verifying deliveries and total loads
-    deliveries: Dict[Tuple[str, int], float] = {}  # (station_id, product) -> total quantity delivered
-    loads: Dict[Tuple[str, int], float] = {}       # (depot_id, product) -> total quantity loaded
+    # Lookup tables for fast access to entities by numeric ID
+    # (built once by parse_instance; rebuilt from the string keys if the instance has none)
+    vehicle_by_id = instance.camions_by_id or {int(k[1:]): v for k, v in instance.camions.items()}
+    depot_by_id = instance.depots_by_id or {int(k[1:]): v for k, v in instance.depots.items()}
+    station_by_id = instance.stations_by_id or {int(k[1:]): v for k, v in instance.stations.items()}
+
+    # Dense distance matrix indexed by small ints (built from the dict if the instance has none)
+    node_index, dmat = instance.node_index, instance.dmat
+    if dmat is None:
+        node_index, dmat = distance_matrix_from_dict(instance.distances)
+    cost_mat = instance.cost_mat
+    if cost_mat is None:
+        cost_mat = cost_matrix_from_dict(instance.costs, instance.num_products)
+    num_cost_products = cost_mat.shape[0]
+
+    # Dense demand/stock matrices, one row per station/depot in instance order
+    # (built from the dicts if the instance has none; a product missing from a depot's stocks is never limited)
+    stations = list(instance.stations.values())
+    depots = list(instance.depots.values())
+    station_demand = instance.station_demand
+    if station_demand is None:
+        station_demand = product_matrix_from_dicts([st.demand for st in stations], instance.num_products)
+    depot_stock = instance.depot_stock
+    if depot_stock is None:
+        depot_stock = product_matrix_from_dicts([d.stocks for d in depots], instance.num_products, np.inf)
+    station_row = {st.id: row for row, st in enumerate(stations)}
+    depot_row = {d.id: row for row, d in enumerate(depots)}
+
+    # Numeric ids known to the instance, for the vectorized per-node checks
+    known_depot_ids = np.fromiter(depot_by_id, dtype=np.int64, count=len(depot_by_id))
+    known_station_ids = np.fromiter(station_by_id, dtype=np.int64, count=len(station_by_id))
+    entity_row = {**station_row, **depot_row}
+
+    # Per-vehicle (row, product, qty) arrays for verifying deliveries and total loads,
+    # scattered into matrices after the loop (row is -1 for a station/depot unknown to the instance)
+    delivery_rows: List[np.ndarray] = []
+    delivery_products: List[np.ndarray] = []
+    delivery_qtys: List[np.ndarray] = []
+    load_rows: List[np.ndarray] = []
+    load_products: List[np.ndarray] = []
+    load_qtys: List[np.ndarray] = []
 
     # Recalculated metrics for validation
     computed_total_changes = 0        # Number of product changes
     computed_total_switch_cost = 0.0  # Total cost of product changes
     computed_distance_total = 0.0     # Total distance traveled by all vehicles
 
+    # Bind the lookups used once per visited node to locals (avoids attribute lookups in the hot loops)
+    node_key = solution_node_key
+    node_index_get = node_index.get
+    entity_row_get = entity_row.get
+
+    # Routes of all vehicles concatenated (vehicle k spans [offsets[k], offsets[k+1])), so that the per-node
+    # checks run once over the whole solution: as stored by parse_solution, or built here from the node dicts
+    # (vehicles that fail the vehicle-level checks below then get an empty span)
+    checked = [
+        v.vehicle_id in vehicle_by_id and len(v.nodes) == len(v.products) and bool(v.nodes)
+        for v in solution.vehicles
+    ]
+    if solution.veh_offsets is not None:
+        all_kinds, all_ids, all_qtys, offsets = solution.kinds, solution.ids, solution.qtys, solution.veh_offsets
+    else:
+        routes = []
+        for v, ok in zip(solution.vehicles, checked):
+            if not ok:
+                routes.append(route_arrays([]))
+            elif v.kinds is not None:
+                routes.append((v.kinds, v.ids, v.qtys))
+            else:
+                routes.append(route_arrays(v.nodes))
+        all_kinds, all_ids, all_qtys, offsets = concat_route_arrays(routes)
+    capacities = [
+        float(vehicle_by_id[v.vehicle_id].capacity) if ok else np.inf for v, ok in zip(solution.vehicles, checked)
+    ]
+    all_flags = _route_error_flags(
+        all_kinds, all_ids, all_qtys, np.repeat(capacities, np.diff(offsets)), offsets,
+        known_depot_ids, known_station_ids,
+    )
+
     # Iterate through each vehicle in the solution
-    for v in solution.vehicles:
+    for vi, v in enumerate(solution.vehicles):
         # Check that the vehicle exists in the instance
         camion = vehicle_by_id.get(v.vehicle_id)
         if camion is None:
@@ -61,11 +191,13 @@ def verify_solution(instance: Instance, solution: ParsedSolutionDat) -> Tuple[Li
             )
             continue
 
-        # Convert nodes to formatted keys (e.g., "D1", "S5", "G2")
-        keyed_nodes = [solution_node_key(n["kind"], n["id"]) for n in v.nodes]
+        # Convert nodes to formatted keys (e.g., "D1", "S5", "G2"), unless parse_solution already did
+        keyed_nodes = v.node_keys if v.node_keys is not None else [node_key(n["kind"], n["id"]) for n in v.nodes]
         if not keyed_nodes:
             errors.append(f"Vehicle {v.vehicle_id}: empty route")
             continue
+        start, end = offsets[vi], offsets[vi + 1]
+        kinds, qtys = all_kinds[start:end], all_qtys[start:end]
 
         # Check that the vehicle departs and returns to the correct garage
         expected_garage = camion.garage_id
@@ -75,99 +207,84 @@ def verify_solution(instance: Instance, solution: ParsedSolutionDat) -> Tuple[Li
             )
 
         # Calculate total distance traveled by this vehicle
-        # Sum of distances between each pair of consecutive nodes
-        for a, b in zip(keyed_nodes, keyed_nodes[1:]):
-            computed_distance_total += float(instance.distances.get((a, b), 0.0))
+        # Gather the distances between consecutive nodes from the dense matrix and sum them;
+        # pairs involving a node unknown to the instance contribute 0
+        idx = np.fromiter((node_index_get(k, -1) for k in keyed_nodes), dtype=np.intp, count=len(keyed_nodes))
+        src, dst = idx[:-1], idx[1:]
+        known = (src >= 0) & (dst >= 0)
+        computed_distance_total += float(dmat[src[known], dst[known]].sum())
 
         # Calculate number and cost of product changes
         # Products are exported with 0-based indexing in the solution
-        products_only = [p for (p, _c) in v.products]
-        for prev_p, cur_p in zip(products_only, products_only[1:]):
-            if prev_p != cur_p:
-                computed_total_changes += 1
-                computed_total_switch_cost += float(instance.costs.get((prev_p, cur_p), 0.0))
+        # A change is any position where the product differs from the previous one; its cost is
+        # gathered from the cost matrix (products outside the matrix contribute 0)
+        if solution.product_offsets is not None:
+            p_arr = solution.product_ids[solution.product_offsets[vi]:solution.product_offsets[vi + 1]]
+        else:
+            p_arr = np.fromiter((p for (p, _c) in v.products), dtype=np.intp, count=len(v.products))
+        changed = p_arr[1:] != p_arr[:-1]
+        computed_total_changes += int(changed.sum())
+        prev_p, cur_p = p_arr[:-1][changed], p_arr[1:][changed]
+        in_range = (prev_p >= 0) & (prev_p < num_cost_products) & (cur_p >= 0) & (cur_p < num_cost_products)
+        computed_total_switch_cost += float(cost_mat[prev_p[in_range], cur_p[in_range]].sum())
+
+        # Per-node checks (computed above for all routes at once)
+        # Materialize the messages only for flagged nodes, in route order
+        flags = all_flags[start:end]
+        for pos in np.flatnonzero(flags).tolist():
+            if flags[pos] & UNKNOWN_DEPOT:
+                errors.append(f"Vehicle {v.vehicle_id}: unknown depot D{v.nodes[pos]['id']}")
+            if flags[pos] & CAPACITY_EXCEEDED:
+                errors.append(
+                    f"Vehicle {v.vehicle_id}: capacity exceeded at depot {keyed_nodes[pos]} (loaded={float(qtys[pos])}, capacity={camion.capacity})"
+                )
+            if flags[pos] & UNKNOWN_STATION:
+                errors.append(f"Vehicle {v.vehicle_id}: unknown station S{v.nodes[pos]['id']}")
+            if flags[pos] & GARAGE_IN_MIDDLE:
+                errors.append(f"Vehicle {v.vehicle_id}: garage in the middle of route (position {pos+1})")
+
+        # Record the quantities loaded at depots and delivered to stations
+        rows = np.fromiter((entity_row_get(k, -1) for k in keyed_nodes), dtype=np.intp, count=len(keyed_nodes))
+        is_depot, is_station = kinds == DEPOT, kinds == STATION
+        load_rows.append(rows[is_depot])
+        load_products.append(p_arr[is_depot])
+        load_qtys.append(qtys[is_depot])
+        delivery_rows.append(rows[is_station])
+        delivery_products.append(p_arr[is_station])
+        delivery_qtys.append(qtys[is_station])
 
         # Verify mass conservation for each segment (depot → stations)
-        # A segment starts at loading from a depot and ends at the next depot or garage
-        current_segment_load = None  # (depot_key, product, qty)
-        current_segment_delivered = 0.0
-
-        # Iterate through each node visited by the vehicle
-        for idx, (node, (p, _cumul)) in enumerate(zip(v.nodes, v.products)):
-            kind = node["kind"]
-            key = solution_node_key(kind, node["id"])
-            qty = float(node.get("qty", 0))
-
-            if kind == "depot":
-                # Handle depots: product loading
-                if node["id"] not in depot_by_id:
-                    errors.append(f"Vehicle {v.vehicle_id}: unknown depot D{node['id']}")
-
-                # Verify that loaded quantity does not exceed truck capacity
-                if qty > float(camion.capacity) + 1e-6:
-                    errors.append(
-                        f"Vehicle {v.vehicle_id}: capacity exceeded at depot {key} (loaded={qty}, capacity={camion.capacity})"
-                    )
-
-                # Accumulate total quantity loaded at this depot for this product
-                loads[(key, p)] = loads.get((key, p), 0.0) + qty
-
-                # Verify mass conservation for previous segment
-                # Loaded quantity must equal quantity delivered at stations
-                """
-                if current_segment_load is not None:
-                    dkey, pp, expected_qty = current_segment_load
-                    if abs(current_segment_delivered - expected_qty) > 1e-2:
-                        errors.append(
-                            f"Vehicle {v.vehicle_id}: mass conservation on segment {dkey} product {pp} (loaded={expected_qty}, delivered={current_segment_delivered})"
-                        )
-                """
-                # Start a new segment
-                current_segment_load = (key, p, qty)
-                current_segment_delivered = 0.0
-
-            elif kind == "station":
-                # Handle stations: product delivery
-                if node["id"] not in station_by_id:
-                    errors.append(f"Vehicle {v.vehicle_id}: unknown station S{node['id']}")
-
-                # Accumulate global deliveries to verify demand satisfaction
-                deliveries[(key, p)] = deliveries.get((key, p), 0.0) + qty
-                current_segment_delivered += qty
-
-            else:
-                # Handle garages: must only be at start and end
-                if idx != 0 and idx != len(v.nodes) - 1:
-                    errors.append(f"Vehicle {v.vehicle_id}: garage in the middle of route (position {idx+1})")
-
-        # Verify mass conservation for the last segment
-        # (segment ending at garage without reloading)
+        # A segment starts at loading from a depot and ends at the next depot;
+        # the loaded quantity must equal the quantity delivered at stations
         """
-        if current_segment_load is not None:
-            dkey, pp, expected_qty = current_segment_load
-            if abs(current_segment_delivered - expected_qty) > 1e-2:
+        depot_positions = np.flatnonzero(is_depot).tolist()
+        for start, end in zip(depot_positions, depot_positions[1:] + [len(kinds)]):
+            segment_delivered = float(qtys[start:end][is_station[start:end]].sum())
+            if abs(segment_delivered - qtys[start]) > 1e-2:
                 errors.append(
-                    f"Vehicle {v.vehicle_id}: mass conservation on segment {dkey} product {pp} (loaded={expected_qty}, delivered={current_segment_delivered})"
+                    f"Vehicle {v.vehicle_id}: mass conservation on segment {keyed_nodes[start]} product {p_arr[start]} (loaded={qtys[start]}, delivered={segment_delivered})"
                 )
         """
 
+    # Total quantity delivered per [station row, product] and loaded per [depot row, product]
+    delivered = _scatter_add(station_demand.shape, delivery_rows, delivery_products, delivery_qtys)
+    loaded = _scatter_add(depot_stock.shape, load_rows, load_products, load_qtys)
+
     # Verify that all station demands are satisfied
     # The instance uses 0-based indexing for products in the demands
-    for st in instance.stations.values():
-        for p, demand in st.demand.items():
-            if demand <= 0:
-                continue
-            delivered = deliveries.get((st.id, p), 0.0)
-            if abs(delivered - float(demand)) > 1e-2:
-                errors.append(f"Unsatisfied demand: {st.id} product {p} (demand={demand}, delivered={delivered})")
+    unsatisfied = (station_demand > 0) & (np.abs(delivered - station_demand) > 1e-2)
+    for row, p in zip(*np.nonzero(unsatisfied)):
+        st = stations[row]
+        errors.append(
+            f"Unsatisfied demand: {st.id} product {p} (demand={st.demand[p]}, delivered={float(delivered[row, p])})"
+        )
 
     # Verify that depot stocks are not exceeded
     # The instance uses 0-based indexing for products in the stocks
-    for d in instance.depots.values():
-        for p, stock in d.stocks.items():
-            taken = loads.get((d.id, p), 0.0)
-            if taken - float(stock) > 1e-2:
-                errors.append(f"Stock exceeded: {d.id} product {p} (stock={stock}, withdrawn={taken})")
+    exceeded = loaded - depot_stock > 1e-2
+    for row, p in zip(*np.nonzero(exceeded)):
+        d = depots[row]
+        errors.append(f"Stock exceeded: {d.id} product {p} (stock={d.stocks[p]}, withdrawn={float(loaded[row, p])})")
 
     # Build the dictionary of recalculated metrics
     computed = {
@@ -179,22 +296,14 @@ def verify_solution(instance: Instance, solution: ParsedSolutionDat) -> Tuple[Li
 
     # Compare the metrics from the file with those recalculated
     # Use a tolerance for float values (rounding in the file)
-    if solution.metrics.get("used_vehicles") != computed["used_vehicles"]:
-        errors.append(
-            f"used_vehicles metric inconsistent: file={solution.metrics.get('used_vehicles')} computed={computed['used_vehicles']}"
-        )
-    if solution.metrics.get("total_changes") != computed["total_changes"]:
-        errors.append(
-            f"total_changes metric inconsistent: file={solution.metrics.get('total_changes')} computed={computed['total_changes']}"
-        )
-    if abs(float(solution.metrics.get("total_switch_cost", 0.0)) - computed["total_switch_cost"]) > 0.2:
-        errors.append(
-            f"total_switch_cost metric inconsistent: file={solution.metrics.get('total_switch_cost')} computed={computed['total_switch_cost']:.2f}"
-        )
-    if abs(float(solution.metrics.get("distance_total", 0.0)) - computed["distance_total"]) > 0.2:
-        errors.append(
-            f"distance_total metric inconsistent: file={solution.metrics.get('distance_total')} computed={computed['distance_total']:.2f}"
-        )
+    for name, tolerance in METRIC_CHECKS:
+        file_value = solution.metrics.get(name)
+        computed_value = computed[name]
+        if tolerance is None:
+            if file_value != computed_value:
+                errors.append(f"{name} metric inconsistent: file={file_value} computed={computed_value}")
+        elif abs(float(solution.metrics.get(name, 0.0)) - computed_value) > tolerance:
+            errors.append(f"{name} metric inconsistent: file={file_value} computed={computed_value:.2f}")
 
     return errors, computed
 
@@ -1,26 +1,51 @@
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Any
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Any, Optional
 
+import numpy as np
 
-@dataclass
+
+class MatrixMapping(Mapping):
+    """Read-only (key_i, key_j) -> float view over a dense matrix, with index[key] giving the row/column."""
+    __slots__ = ("_matrix", "_index")
+
+    def __init__(self, matrix: np.ndarray, index: Dict[Any, int]):
+        self._matrix = matrix
+        self._index = index
+
+    def __getitem__(self, key):
+        try:
+            key_i, key_j = key
+            return float(self._matrix[self._index[key_i], self._index[key_j]])
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return ((key_i, key_j) for key_i in self._index for key_j in self._index)
+
+    def __len__(self):
+        return len(self._index) ** 2
+
+
+@dataclass(slots=True)
 class Camion:
     id: str
     capacity: float
     garage_id: int
     initial_product: int
 
-@dataclass
+@dataclass(slots=True)
 class Depot:
     id: str
     location: tuple  # (x, y)
     stocks: Dict[int, int]  # product_id -> quantity
 
-@dataclass
+@dataclass(slots=True)
 class Garage:
     id: str
     location: tuple  # (x, y)
 
-@dataclass
+@dataclass(slots=True)
 class Station:
     id: str
     location: tuple  # (x, y)
@@ -38,8 +63,16 @@ class Instance:
     depots: Dict[str, Depot]
     garages: Dict[str, Garage]
     stations: Dict[str, Station]
-    costs: Dict[tuple, float]  # (from_id, to_id) -> cost
-    distances: Dict[tuple, float]  # (from_id, to_id) -> distance
+    costs: Mapping  # (from_id, to_id) -> cost (a MatrixMapping over cost_mat when parsed)
+    distances: Mapping  # (from_id, to_id) -> distance (a MatrixMapping over dmat when parsed)
+    node_index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)  # node_id -> index in dmat
+    dmat: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # dense distance matrix (N x N)
+    cost_mat: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # transition costs (P x P)
+    depot_stock: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # stocks per depot (D x P)
+    station_demand: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # demand per station (S x P)
+    camions_by_id: Dict[int, Camion] = field(default_factory=dict, repr=False, compare=False)  # 1 -> camions["K1"]
+    depots_by_id: Dict[int, Depot] = field(default_factory=dict, repr=False, compare=False)  # 1 -> depots["D1"]
+    stations_by_id: Dict[int, Station] = field(default_factory=dict, repr=False, compare=False)  # 1 -> stations["S1"]
 
 
 @dataclass(frozen=True)
@@ -47,9 +80,23 @@ class ParsedSolutionVehicle:
     vehicle_id: int
     nodes: List[Dict[str, Any]]
     products: List[Tuple[int, float]]
+    kinds: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # node kind codes (int8)
+    ids: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # node numeric ids (int64)
+    qtys: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # node quantities (float64)
+    node_keys: Optional[List[str]] = field(default=None, repr=False, compare=False)  # node keys ("G1", "D3", ...)
 
 
 @dataclass(frozen=True)
 class ParsedSolutionDat:
     vehicles: List[ParsedSolutionVehicle]
     metrics: Dict[str, Any]
+    # Routes of all vehicles concatenated (vehicle k spans [veh_offsets[k], veh_offsets[k+1]))
+    kinds: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # node kind codes (int8)
+    ids: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # node numeric ids (int64)
+    qtys: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # node quantities (float64)
+    veh_offsets: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # route bounds (V + 1)
+    veh_ids: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # vehicle ids (V)
+    # Product sequences of all vehicles concatenated (vehicle k spans [product_offsets[k], product_offsets[k+1]))
+    product_ids: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # products (int64)
+    product_costs: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # cumulative costs (float64)
+    product_offsets: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # bounds (V + 1)
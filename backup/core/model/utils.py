@@ -1,84 +1,140 @@
 import math
+import os
+import re
 
-from typing import Dict, List, Tuple, Any
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Tuple, Any, TextIO, Union
 
-from .schemas import Camion, Depot, Garage, Station, Instance, ParsedSolutionDat, ParsedSolutionVehicle
+import numpy as np
+
+from .schemas import (
+    Camion, Depot, Garage, Station, Instance, MatrixMapping, ParsedSolutionDat, ParsedSolutionVehicle,
+)
 
 
 def euclidean_distance(point1: tuple, point2: tuple) -> float:
     """Calculer la distance euclidienne entre deux points 2D."""
-    return math.sqrt((point1[0] - point2[0]) ** 2 + (point1[1] - point2[1]) ** 2)
+    return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
+
+
+def _load_block(file, num_rows: int, num_cols: int, int_cols: Tuple[int, ...] = ()) -> np.ndarray:
+    """
+    Lire les num_rows lignes suivantes du fichier sous forme de tableau numérique (num_rows × num_cols).
+
+    Les lignes sont analysées directement par le parseur C de NumPy sans matérialiser de liste de chaînes.
+    Lève ValueError si le bloc est incomplet, contient moins de num_cols colonnes, si ses lignes n'ont
+    pas toutes le même nombre de valeurs (une valeur en trop sur une seule ligne est rejetée), ou si une
+    colonne de int_cols (identifiants, stocks, demandes) contient une valeur non entière.
+    """
+    if num_rows == 0:
+        return np.empty((0, num_cols), dtype=np.float64)
+    block = np.loadtxt(islice(file, num_rows), dtype=np.float64, ndmin=2)
+    if block.shape[0] != num_rows or block.shape[1] < num_cols:
+        raise ValueError(f"bloc de {num_rows} ligne(s) × {num_cols} colonne(s) attendu, trouvé {block.shape}")
+    block = block[:, :num_cols]
+    if int_cols:
+        values = block[:, list(int_cols)]
+        integral = np.isfinite(values) & (values == np.floor(values))
+        if not integral.all():
+            row, col = np.argwhere(~integral)[0]
+            raise ValueError(f"valeur entière attendue ligne {row + 1} colonne {int_cols[col] + 1}, trouvé {values[row, col]}")
+    return block
 
 
 def parse_instance(filepath: str) -> Instance:
-    """Extraire les données du fichier .dat et les organiser dans une instance de la classe Instance."""
+    """
+    Extraire les données du fichier .dat et les organiser dans une instance de la classe Instance.
+
+    Chaque appel analyse le fichier : à utiliser pour les fichiers ponctuels (instances téléversées).
+    Les instances officielles, relues à chaque soumission, passent par parse_instance_cached.
+    """
+    return _parse_instance_file(filepath)
+
+
+def parse_instance_cached(filepath: str) -> Instance:
+    """
+    Variante de parse_instance mise en cache selon (chemin, date de modification, taille) : un fichier
+    inchangé n'est analysé qu'une fois. L'instance retournée est partagée entre les appels et ne doit
+    pas être modifiée. Réservée au scoring des instances officielles.
+    """
     try:
-        # Extraire toutes les lignes du fichier
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Le fichier {filepath} est introuvable.")
+    except OSError as e:
+        raise RuntimeError(f"Une erreur est survenue lors de l'analyse du fichier {filepath}: {e}")
+
+    return _parse_instance_cached(filepath, stat.st_mtime_ns, stat.st_size)
+
+
+# Une soumission parcourt les 150 instances officielles dans le même ordre : un cache plus petit
+# serait entièrement évincé (LRU sur un accès cyclique) avant la soumission suivante.
+@lru_cache(maxsize=256)
+def _parse_instance_cached(filepath: str, mtime_ns: int, size: int) -> Instance:
+    """Analyser le fichier .dat ; mtime_ns et size ne servent qu'à invalider le cache de parse_instance_cached."""
+    return _parse_instance_file(filepath)
+
+
+def _parse_instance_file(filepath: str) -> Instance:
+    """Analyser le fichier .dat (sans cache)."""
+    try:
+        # Lire le fichier section par section (sans charger toutes les lignes en mémoire)
         with open(filepath, 'r') as file:
-            lines = [line.strip() for line in file.readlines()]
-
-        # 1ère ligne: UUID de l'instance
-        # instance_id = lines[0]
-
-        # 2ème ligne: Nombre de produits, depôts, garages, stations, camions
-        num_products, num_depots, num_garages, num_stations, num_camions = map(int, lines[1].split())
-
-        # num_products lignes suivantes : Matrice des coûts de transition de produits
-        # Dimension : NbProduits × NbProduits
-        # Représente le coût de changement du produit i vers le produit j
-        costs = {}
-        cost_start_line = 2
-        for i in range(num_products):
-            cost_values = list(map(float, lines[cost_start_line + i].split()))
-            for j in range(num_products):
-                costs[(i, j)] = cost_values[j]
-
-        current_line = cost_start_line + num_products
-
-        # Camions (num_camions lignes) : ID  Capacité  GarageOrigine  ProduitInitial
-        camions = {}
-        for i in range(num_camions):
-            camion_data = lines[current_line + i].split()
-            camion_id = f"K{int(camion_data[0])}"
-            capacity = float(camion_data[1])
-            garage_id = f"G{int(camion_data[2])}"
-            initial_product = int(camion_data[3])
-            camions[camion_id] = Camion(camion_id, capacity, garage_id, initial_product)
-
-        current_line += num_camions
-
-        # Depôts (num_depots lignes) : ID  X  Y  StockProduit1  StockProduit2  ...  StockProduitN
-        depots = {}
-        for i in range(num_depots):
-            depot_data = lines[current_line + i].split()
-            depot_id = f"D{int(depot_data[0])}"
-            x = float(depot_data[1])
-            y = float(depot_data[2])
-            stocks = {pid: int(depot_data[3 + pid]) for pid in range(num_products)}
-            depots[depot_id] = Depot(depot_id, (x, y), stocks)
-
-        current_line += num_depots
-
-        # Garages (num_garages lignes) : ID  X  Y
+            # 1ère ligne: UUID de l'instance
+            next(file)
+
+            # 2ème ligne: Nombre de produits, depôts, garages, stations, camions
+            num_products, num_depots, num_garages, num_stations, num_camions = map(int, next(file).split())
+
+            # num_products lignes suivantes : Matrice des coûts de transition de produits
+            # Dimension : NbProduits × NbProduits
+            # Représente le coût de changement du produit i vers le produit j
+            cost_mat = _load_block(file, num_products, num_products)
+
+            # Colonnes entières des dépôts et stations : ID puis une quantité par produit
+            quantity_cols = (0, *range(3, 3 + num_products))
+
+            # Camions (num_camions lignes) : ID  Capacité  GarageOrigine  ProduitInitial
+            camion_block = _load_block(file, num_camions, 4, int_cols=(0, 2, 3))
+
+            # Depôts (num_depots lignes) : ID  X  Y  StockProduit1  StockProduit2  ...  StockProduitN
+            depot_block = _load_block(file, num_depots, 3 + num_products, int_cols=quantity_cols)
+
+            # Garages (num_garages lignes) : ID  X  Y
+            garage_block = _load_block(file, num_garages, 3, int_cols=(0,))
+
+            # Stations (num_stations lignes) : ID  X  Y  DemandeProduit1  DemandeProduit2  ...  DemandeProduitN
+            station_block = _load_block(file, num_stations, 3 + num_products, int_cols=quantity_cols)
+
+        # Les coûts restent dans la matrice dense ; costs n'en est qu'une vue (p, q) -> coût
+        costs = MatrixMapping(cost_mat, {p: p for p in range(num_products)})
+
+        # Construire les dictionnaires une seule fois à partir des tableaux
+
+        # Chaque entité est indexée par son id texte ("K1") et par son id numérique (1)
+        camions, camions_by_id = {}, {}
+        for camion_id, capacity, garage_id, initial_product in camion_block.tolist():
+            camion = Camion(f"K{int(camion_id)}", capacity, f"G{int(garage_id)}", int(initial_product))
+            camions[camion.id] = camions_by_id[int(camion_id)] = camion
+
+        depot_stock = depot_block[:, 3:].astype(np.int64)
+        station_demand = station_block[:, 3:].astype(np.int64)
+
+        depots, depots_by_id = {}, {}
+        for row, stocks in zip(depot_block[:, :3].tolist(), depot_stock.tolist()):
+            depot = Depot(f"D{int(row[0])}", (row[1], row[2]), dict(enumerate(stocks)))
+            depots[depot.id] = depots_by_id[int(row[0])] = depot
+
         garages = {}
-        for i in range(num_garages):
-            garage_data = lines[current_line + i].split()
-            garage_id = f"G{int(garage_data[0])}"
-            x = float(garage_data[1])
-            y = float(garage_data[2])
+        for garage_id, x, y in garage_block.tolist():
+            garage_id = f"G{int(garage_id)}"
             garages[garage_id] = Garage(garage_id, (x, y))
 
-        current_line += num_garages
-
-        # Stations (num_stations lignes) : ID  X  Y  DemandeProduit1  DemandeProduit2  ...  DemandeProduitN
-        stations = {}
-        for i in range(num_stations):
-            station_data = lines[current_line + i].split()
-            station_id = f"S{int(station_data[0])}"
-            x = float(station_data[1])
-            y = float(station_data[2])
-            demand = {pid: int(station_data[3 + pid]) for pid in range(num_products)}
-            stations[station_id] = Station(station_id, (x, y), demand)
+        stations, stations_by_id = {}, {}
+        for row, demand in zip(station_block[:, :3].tolist(), station_demand.tolist()):
+            station = Station(f"S{int(row[0])}", (row[1], row[2]), dict(enumerate(demand)))
+            stations[station.id] = stations_by_id[int(row[0])] = station
 
         instance = Instance(
             num_products=num_products,
@@ -91,12 +147,22 @@ def parse_instance(filepath: str) -> Instance:
             garages=garages,
             stations=stations,
             costs=costs,
-            distances={}
+            distances={},
+            cost_mat=cost_mat,
+            depot_stock=depot_stock,
+            station_demand=station_demand,
+            camions_by_id=camions_by_id,
+            depots_by_id=depots_by_id,
+            stations_by_id=stations_by_id
         )
 
         # Calculer et ajouter les distances euclidiennes entre tous les nœuds du réseau
-        distances = compute_distances(instance)
-        instance.distances = distances
+        # La matrice dense sert aux calculs vectorisés ; distances n'en est qu'une vue (id_i, id_j) -> distance,
+        # sans construire de dictionnaire de N² entrées
+        node_index, dmat = compute_distance_matrix(instance)
+        instance.node_index = node_index
+        instance.dmat = dmat
+        instance.distances = MatrixMapping(dmat, node_index)
 
         return instance
 
@@ -107,12 +173,12 @@ def parse_instance(filepath: str) -> Instance:
         raise RuntimeError(f"Une erreur est survenue lors de l'analyse du fichier {filepath}: {e}")
 
 
-def compute_distances(instance: Instance) -> dict:
+def compute_distance_matrix(instance: Instance) -> Tuple[Dict[str, int], np.ndarray]:
     """
-    Calculer les distances euclidiennes entre tous les points (dépôts, garages, stations) de l'instance.
+    Calculer la matrice dense des distances euclidiennes entre tous les points (dépôts, garages, stations).
 
-    Retourne un dictionnaire avec les clés (id_noeud_i, id_noeud_j) et les valeurs = distance euclidienne.
-    Cette matrice de distances est utilisée pour calculer les coûts de déplacement dans le modèle.
+    Retourne (node_index, dmat) où node_index associe chaque id de nœud à sa ligne/colonne dans dmat,
+    une matrice float64 de dimension N × N.
     """
     locations = {}
 
@@ -128,17 +194,79 @@ def compute_distances(instance: Instance) -> dict:
     for station in instance.stations.values():
         locations[station.id] = station.location
 
-    # Calculer les distances euclidiennes entre tous les points
-    # Complexité : O(n²) où n = nombre total de nœuds (dépôts + garages + stations)
-    distances = {}
+    # Calculer les distances euclidiennes en une seule opération vectorisée au lieu d'une double boucle Python.
+    # La distance est symétrique et nulle sur la diagonale : seul le triangle supérieur est calculé, puis recopié.
     ids = list(locations.keys())
-    for i in range(len(ids)):
-        for j in range(len(ids)):
-            from_id = ids[i]
-            to_id = ids[j]
-            distances[(from_id, to_id)] = euclidean_distance(locations[from_id], locations[to_id])
+    coords = np.asarray([locations[node_id] for node_id in ids], dtype=np.float64).reshape(-1, 2)
+    rows, cols = np.triu_indices(len(ids), k=1)
+    diff = coords[rows] - coords[cols]
+    dmat = np.zeros((len(ids), len(ids)), dtype=np.float64)
+    dmat[rows, cols] = np.hypot(diff[:, 0], diff[:, 1])
+    dmat[cols, rows] = dmat[rows, cols]
+
+    return {node_id: idx for idx, node_id in enumerate(ids)}, dmat
+
+
+def _distance_dict(node_index: Dict[str, int], dmat: np.ndarray) -> dict:
+    """Convertir une matrice dense de distances en dictionnaire (id_noeud_i, id_noeud_j) -> distance."""
+    ids = list(node_index.keys())
+    return dict(zip(((from_id, to_id) for from_id in ids for to_id in ids), dmat.ravel().tolist()))
+
+
+def distance_matrix_from_dict(distances: Dict[tuple, float]) -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    Construire (node_index, dmat) à partir d'un dictionnaire de distances (id_noeud_i, id_noeud_j) -> distance.
 
-    return distances
+    Utilisé lorsque l'instance n'a pas été produite par parse_instance (matrice dense absente).
+    Les paires absentes du dictionnaire valent 0.0.
+    """
+    ids = list(dict.fromkeys(node_id for pair in distances for node_id in pair))
+    node_index = {node_id: idx for idx, node_id in enumerate(ids)}
+    dmat = np.zeros((len(ids), len(ids)), dtype=np.float64)
+    for (from_id, to_id), dist in distances.items():
+        dmat[node_index[from_id], node_index[to_id]] = dist
+    return node_index, dmat
+
+
+def cost_matrix_from_dict(costs: Dict[tuple, float], num_products: int) -> np.ndarray:
+    """
+    Construire la matrice dense des coûts de transition à partir du dictionnaire (p, q) -> coût.
+
+    Utilisé lorsque l'instance n'a pas été produite par parse_instance (matrice dense absente).
+    Les paires absentes du dictionnaire valent 0.0.
+    """
+    size = max([num_products] + [max(pair) + 1 for pair in costs])
+    cost_mat = np.zeros((size, size), dtype=np.float64)
+    for (p, q), cost in costs.items():
+        cost_mat[p, q] = cost
+    return cost_mat
+
+
+def product_matrix_from_dicts(quantities: List[Dict[int, float]], num_products: int, fill_value: float = 0.0) -> np.ndarray:
+    """
+    Construire une matrice dense (nombre d'entités × produits) à partir des dictionnaires produit -> quantité
+    (stocks des dépôts ou demandes des stations), une ligne par entité dans l'ordre fourni.
+
+    Utilisé lorsque l'instance n'a pas été produite par parse_instance (matrices denses absentes).
+    Les produits absents d'un dictionnaire valent fill_value.
+    """
+    size = max([num_products] + [p + 1 for q in quantities for p in q])
+    mat = np.full((len(quantities), size), fill_value, dtype=np.float64)
+    for row, q in enumerate(quantities):
+        for p, value in q.items():
+            mat[row, p] = value
+    return mat
+
+
+def compute_distances(instance: Instance) -> dict:
+    """
+    Calculer les distances euclidiennes entre tous les points (dépôts, garages, stations) de l'instance.
+
+    Retourne un dictionnaire avec les clés (id_noeud_i, id_noeud_j) et les valeurs = distance euclidienne.
+    Cette matrice de distances est utilisée pour calculer les coûts de déplacement dans le modèle.
+    """
+    node_index, dmat = compute_distance_matrix(instance)
+    return _distance_dict(node_index, dmat)
 
 
 def _parse_solution_route_token(token: str) -> Dict[str, Any]:
@@ -194,6 +322,59 @@ def _parse_solution_product_token(token: str) -> Tuple[int, float]:
     return product, cost
 
 
+# Expressions régulières précompilées pour analyser d'un seul coup une ligne de route ou de produits bien formée :
+# jetons séparés par des tirets, chaque jeton étant "id", "id[qty]" ou "id(qty)" (resp. "p(coût)")
+_ROUTE_TOKEN = r"[0-9]+\s*(?:\[\s*[0-9]+\s*\]|\(\s*[0-9]+\s*\))?"
+_ROUTE_LINE_RE = re.compile(rf"[\s-]*(?:{_ROUTE_TOKEN}(?:\s*-[\s-]*{_ROUTE_TOKEN})*)?[\s-]*")
+_ROUTE_TOKEN_RE = re.compile(r"([0-9]+)\s*(?:\[\s*([0-9]+)\s*\]|\(\s*([0-9]+)\s*\))?")
+_PRODUCT_TOKEN = r"[0-9]+\s*\(\s*(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE]\+?[0-9]+)?\s*\)"
+_PRODUCT_LINE_RE = re.compile(rf"[\s-]*(?:{_PRODUCT_TOKEN}(?:\s*-[\s-]*{_PRODUCT_TOKEN})*)?[\s-]*")
+_PRODUCT_TOKEN_RE = re.compile(r"([0-9]+)\s*\(\s*([^)\s]+)\s*\)")
+
+
+def _parse_solution_route(route_part: str) -> List[Dict[str, Any]]:
+    """
+    Analyser la partie route d'une ligne de véhicule ("1 - 1[500] - 5(300) - 1").
+
+    Une ligne bien formée est découpée en une seule passe par expression régulière ; sinon, l'analyse
+    jeton par jeton (_parse_solution_route_token) est utilisée pour lever les mêmes erreurs qu'auparavant.
+    """
+    if _ROUTE_LINE_RE.fullmatch(route_part):
+        nodes = []
+        for node_id, depot_qty, station_qty in _ROUTE_TOKEN_RE.findall(route_part):
+            if depot_qty:
+                nodes.append({"kind": "depot", "id": int(node_id), "qty": int(depot_qty)})
+            elif station_qty:
+                nodes.append({"kind": "station", "id": int(node_id), "qty": int(station_qty)})
+            else:
+                nodes.append({"kind": "garage", "id": int(node_id), "qty": 0})
+        return nodes
+
+    route_tokens = [t.strip() for t in route_part.split("-")]
+    return [_parse_solution_route_token(t) for t in route_tokens if t]
+
+
+def _parse_solution_products(prod_part: str) -> List[Tuple[int, float]]:
+    """
+    Analyser la partie produits d'une ligne de véhicule ("0(0.0) - 1(12.5) - 1(12.5)").
+
+    Même principe que _parse_solution_route : une passe par expression régulière si la ligne est bien formée,
+    sinon analyse jeton par jeton (_parse_solution_product_token).
+    """
+    if _PRODUCT_LINE_RE.fullmatch(prod_part):
+        return [(int(product), float(cost)) for product, cost in _PRODUCT_TOKEN_RE.findall(prod_part)]
+
+    prod_tokens = [t.strip() for t in prod_part.split("-")]
+    return [_parse_solution_product_token(t) for t in prod_tokens if t]
+
+
+# Codes entiers des types de nœuds, pour représenter une tournée sous forme de tableaux NumPy
+GARAGE, DEPOT, STATION = 0, 1, 2
+NODE_KIND_CODES = {"garage": GARAGE, "depot": DEPOT, "station": STATION}
+_NODE_KEY_PREFIXES = {"garage": "G", "depot": "D", "station": "S"}
+
+
+@lru_cache(maxsize=4096)
 def solution_node_key(kind: str, node_id: int) -> str:
     """
     Convertir un type de nœud et un ID numérique en clé de nœud formatée.
@@ -202,17 +383,49 @@ def solution_node_key(kind: str, node_id: int) -> str:
     - ("garage", 1) -> "G1"
     - ("depot", 3) -> "D3"
     - ("station", 5) -> "S5"
+
+    Les clés sont mémorisées : un même nœud visité plusieurs fois réutilise la même chaîne
+    (ce qui tient lieu d'internement pour les dictionnaires indexés par ces clés).
     """
-    if kind == "garage":
-        return f"G{node_id}"
-    if kind == "depot":
-        return f"D{node_id}"
-    if kind == "station":
-        return f"S{node_id}"
-    raise ValueError(f"Unknown kind: {kind}")
+    prefix = _NODE_KEY_PREFIXES.get(kind)
+    if prefix is None:
+        raise ValueError(f"Unknown kind: {kind}")
+    return f"{prefix}{node_id}"
 
 
-def parse_solution(filepath: str) -> ParsedSolutionDat:
+def route_arrays(nodes: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convertir la liste des nœuds d'une tournée en trois tableaux parallèles :
+    codes de type (int8, voir NODE_KIND_CODES), IDs numériques (int64) et quantités (float64).
+    """
+    try:
+        kinds = np.fromiter((NODE_KIND_CODES[n["kind"]] for n in nodes), dtype=np.int8, count=len(nodes))
+    except KeyError:
+        # Lever la même erreur que solution_node_key pour un type de nœud inconnu
+        for n in nodes:
+            solution_node_key(n["kind"], n["id"])
+        raise
+    ids = np.fromiter((n["id"] for n in nodes), dtype=np.int64, count=len(nodes))
+    qtys = np.fromiter((float(n.get("qty", 0)) for n in nodes), dtype=np.float64, count=len(nodes))
+    return kinds, ids, qtys
+
+
+def concat_route_arrays(
+    routes: List[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Concaténer les tableaux (kinds, ids, qtys) de plusieurs tournées en un seul jeu de tableaux contigus.
+
+    Retourne (kinds, ids, qtys, offsets) où la tournée k occupe les positions [offsets[k], offsets[k+1]).
+    """
+    offsets = np.cumsum([0] + [len(kinds) for kinds, _ids, _qtys in routes], dtype=np.intp)
+    kinds = np.concatenate([np.empty(0, dtype=np.int8)] + [route[0] for route in routes])
+    ids = np.concatenate([np.empty(0, dtype=np.int64)] + [route[1] for route in routes])
+    qtys = np.concatenate([np.empty(0, dtype=np.float64)] + [route[2] for route in routes])
+    return kinds, ids, qtys, offsets
+
+
+def parse_solution(filepath: Union[str, TextIO]) -> ParsedSolutionDat:
     """
     Analyser un fichier de solution (.dat) contenant les tournées des véhicules et les métriques.
 
@@ -232,16 +445,21 @@ def parse_solution(filepath: str) -> ParsedSolutionDat:
       * Processeur utilisé
       * Temps d'exécution
 
+    `filepath` peut aussi être un flux texte déjà ouvert (ex. membre d'un ZIP lu sans extraction).
+
     Retourne un objet ParsedSolutionDat avec les tournées et les métriques.
     """
-    with open(filepath, "r") as f:
-        raw_lines = [line.rstrip("\n") for line in f]
+    if isinstance(filepath, str):
+        with open(filepath, "r") as f:
+            raw_lines = [line.rstrip("\n") for line in f]
+    else:
+        raw_lines = [line.rstrip("\n") for line in filepath]
 
     # Conserver les lignes vides pour séparer les blocs de véhicules ; supprimer les lignes vides finales
     while raw_lines and not raw_lines[-1].strip():
         raw_lines.pop()
 
-    vehicles: List[ParsedSolutionVehicle] = []
+    blocks: List[Tuple[int, List[Dict[str, Any]], List[Tuple[int, float]]]] = []  # (vehicle_id, nodes, products)
     i = 0
 
     def _is_vehicle_line(line: str) -> bool:
@@ -265,16 +483,12 @@ def parse_solution(filepath: str) -> ParsedSolutionDat:
             raise ValueError(f"Mismatched vehicle ids: {v1} vs {v2}")
 
         # Analyser la séquence de nœuds visités (route)
-        route_tokens = [t.strip() for t in route_part.split("-")]
-        route_tokens = [t for t in route_tokens if t]
-        nodes = [_parse_solution_route_token(t) for t in route_tokens]
+        nodes = _parse_solution_route(route_part)
 
         # Analyser la séquence de produits transportés avec coûts cumulés
-        prod_tokens = [t.strip() for t in prod_part.split("-")]
-        prod_tokens = [t for t in prod_tokens if t]
-        products = [_parse_solution_product_token(t) for t in prod_tokens]
+        products = _parse_solution_products(prod_part)
 
-        vehicles.append(ParsedSolutionVehicle(vehicle_id=vehicle_id, nodes=nodes, products=products))
+        blocks.append((vehicle_id, nodes, products))
 
         i += 2
         # Ligne de séparation optionnelle entre les blocs de véhicules
@@ -295,4 +509,30 @@ def parse_solution(filepath: str) -> ParsedSolutionDat:
         "time": float(metrics_lines[5]),
     }
 
-    return ParsedSolutionDat(vehicles=vehicles, metrics=metrics)
+    # Représentation en tableaux de toutes les tournées, concaténées dans des tableaux contigus,
+    # utilisée par la vérification vectorisée ; chaque véhicule en reçoit une vue sur sa tranche
+    kinds, ids, qtys, veh_offsets = concat_route_arrays([route_arrays(nodes) for _vid, nodes, _prods in blocks])
+    product_offsets = np.cumsum([0] + [len(products) for _vid, _nodes, products in blocks], dtype=np.intp)
+    product_ids = np.fromiter(
+        (p for _vid, _nodes, products in blocks for p, _cost in products), dtype=np.int64, count=product_offsets[-1]
+    )
+    product_costs = np.fromiter(
+        (cost for _vid, _nodes, products in blocks for _p, cost in products), dtype=np.float64, count=product_offsets[-1]
+    )
+
+    vehicles: List[ParsedSolutionVehicle] = []
+    for k, (vehicle_id, nodes, products) in enumerate(blocks):
+        start, end = veh_offsets[k], veh_offsets[k + 1]
+        vehicles.append(ParsedSolutionVehicle(
+            vehicle_id=vehicle_id, nodes=nodes, products=products,
+            kinds=kinds[start:end], ids=ids[start:end], qtys=qtys[start:end],
+            # Clés des nœuds issues du cache de solution_node_key : une seule chaîne par nœud distinct
+            node_keys=[solution_node_key(n["kind"], n["id"]) for n in nodes],
+        ))
+
+    return ParsedSolutionDat(
+        vehicles=vehicles, metrics=metrics,
+        kinds=kinds, ids=ids, qtys=qtys, veh_offsets=veh_offsets,
+        veh_ids=np.fromiter((vid for vid, _nodes, _prods in blocks), dtype=np.int64, count=len(blocks)),
+        product_ids=product_ids, product_costs=product_costs, product_offsets=product_offsets,
+    )
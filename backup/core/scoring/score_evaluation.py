@@ -1,14 +1,29 @@
+import io
 import os
 import zipfile
-import shutil
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
-from .utils import _discover_category_dirs, _validate_zip_structure, _format_processor_info, _failed_result
+from backup.core.model.feasibility import verify_solution
+from backup.core.model.utils import parse_instance_cached, parse_solution
+
+from .utils import _ZipTree, _discover_category_dirs, _validate_zip_structure, _format_processor_info, _failed_result
+
+
+def _parse_workers(value) -> int:
+    """Worker count from a SCORING_WORKERS value; anything unparsable or below 1 means serial scoring."""
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
 
 
 COEFFS = {"small": 1.0, "medium": 0.5, "large": 0.2}
 BIG_M = 100000.0
 NUMBER_OF_INSTANCES_PER_CATEGORY = 50
+# Worker processes used to verify the solutions of a submission. Serial by default: each worker
+# starts with an empty parse_instance_cached cache, which the main process keeps warm across submissions.
+SCORING_WORKERS = _parse_workers(os.getenv("SCORING_WORKERS", "1"))
 
 logger = logging.getLogger(__name__)
 
@@ -16,38 +31,65 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.pa
 INSTANCES_ROOT = os.path.join(BASE_DIR, "data", "instances")
 
 
+def _score_job(job: tuple) -> tuple:
+    """Parses and verifies one (instance path, solution text) job, serially or in a worker process;
+    returns (errors, metrics)."""
+    inst_path, sol_text = job
+    try:
+        instance_obj = parse_instance_cached(inst_path)
+        solution_obj = parse_solution(io.StringIO(sol_text))
+        return verify_solution(instance_obj, solution_obj)
+    except Exception as e:
+        return [f"Technical error during parsing: {e}"], {}
+
+
+def _score_jobs(jobs: list) -> list:
+    """Scores every job, in order, serially or on a process pool depending on SCORING_WORKERS."""
+    workers = min(SCORING_WORKERS, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_score_job, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+
+    return [_score_job(job) for job in jobs]
+
+
 def process_full_submission(zip_path: str) -> dict:
     """Evaluates a ZIP submission and returns a results dictionary.
 
     :param zip_path: Path to the submitted ZIP file.
     :return: Dictionary with score, feasibility, and details per instance.
     """
+    # Solutions are read straight from the archive; nothing is extracted to disk and
+    # extract_path is only the virtual root used for the paths shown in the report.
     extract_path = f"temp_extract_{os.path.basename(zip_path)}"
     total_valid_instances = 0
     results_per_category = {"small": 0, "medium": 0, "large": 0}
     instance_results = []
+    zip_ref = None
 
     try:
         if not os.path.exists(zip_path):
             return _failed_result(f"ZIP file not found: {zip_path}")
 
         try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_path)
+            zip_ref = zipfile.ZipFile(zip_path, 'r')
+            zip_tree = _ZipTree(zip_ref, extract_path)
         except zipfile.BadZipFile:
             return _failed_result("The submitted file is not a valid ZIP file.")
         except Exception as e:
             return _failed_result(f"Error during extraction: {e}")
 
-        category_dirs, discovery_warnings = _discover_category_dirs(extract_path)
-        structure_report = _validate_zip_structure(extract_path, category_dirs, discovery_warnings)
+        category_dirs, discovery_warnings = _discover_category_dirs(extract_path, zip_tree.walk)
+        structure_report = _validate_zip_structure(extract_path, category_dirs, discovery_warnings, zip_tree.listdir)
         processor_info = _format_processor_info(structure_report)
 
-        total_weighted_sum = 0
-        fully_feasible = True
+        # 1) One scoring job per instance that has both an official instance and a solution file;
+        #    every other instance already has its final error.
+        slots = []  # (category, sol_name, errors, job index or None)
+        jobs = []  # (instance path, solution text)
 
-        for category, weight in COEFFS.items():
-            category_score = 0
+        for category in COEFFS:
+            prefix = category[0].upper()
             instance_dir = os.path.join(INSTANCES_ROOT, category)
             cat_info = structure_report["by_category"].get(category, {})
             category_path = category_dirs.get(category)
@@ -63,11 +105,9 @@ def process_full_submission(zip_path: str) -> dict:
 
             for i in range(1, NUMBER_OF_INSTANCES_PER_CATEGORY + 1):
                 num_str = f"{i:03d}"
-                prefix = category[0].upper()
                 sol_name = f"Sol_{prefix}_{num_str}.dat"
                 errors = []
-                metrics = {}
-                feasible = False
+                job_index = None
 
                 if not cat_info.get("present", False):
                     errors = [f"Category {category} missing from ZIP."]
@@ -79,40 +119,55 @@ def process_full_submission(zip_path: str) -> dict:
 
                     if not inst_filename:
                         errors = [f"Official instance {num_str} not found on server."]
-                    elif not sol_path or not os.path.exists(sol_path):
+                    elif not sol_path or not zip_tree.exists(sol_path):
                         errors = [f"No valid solution file found for instance {num_str}."]
                     else:
                         try:
-                            from backup.core.model.feasibility import verify_solution
-                            from backup.core.model.utils import parse_instance, parse_solution
-                            instance_obj = parse_instance(inst_path)
-                            solution_obj = parse_solution(str(sol_path))
-                            errors, metrics = verify_solution(instance_obj, solution_obj)
-                            feasible = (len(errors) == 0)
-                            if feasible:
-                                total_valid_instances += 1
-                                results_per_category[category] += 1
+                            with zip_tree.open(sol_path) as sol_file:
+                                jobs.append((inst_path, sol_file.read()))
+                            job_index = len(jobs) - 1
                         except Exception as e:
                             errors = [f"Technical error during parsing: {e}"]
 
-                instance_score = (
-                    metrics.get("distance_total", 0) + metrics.get("total_switch_cost", 0)
-                    if feasible else BIG_M
-                )
-                if not feasible:
-                    fully_feasible = False
-
-                category_score += instance_score
-                instance_results.append({
-                    "instance": sol_name,
-                    "category": category,
-                    "feasible": feasible,
-                    "distance": metrics.get("distance_total", 0),
-                    "transition_cost": metrics.get("total_switch_cost", 0),
-                    "errors": errors,
-                })
-
-            total_weighted_sum += category_score * weight
+                slots.append((category, sol_name, errors, job_index))
+
+        # 2) Score the jobs (in worker processes when SCORING_WORKERS > 1).
+        outcomes = _score_jobs(jobs)
+
+        # 3) Aggregate in submission order.
+        category_scores = {category: 0 for category in COEFFS}
+        fully_feasible = True
+
+        for category, sol_name, errors, job_index in slots:
+            metrics = {}
+            feasible = False
+            if job_index is not None:
+                errors, metrics = outcomes[job_index]
+                feasible = (len(errors) == 0)
+                if feasible:
+                    total_valid_instances += 1
+                    results_per_category[category] += 1
+
+            instance_score = (
+                metrics.get("distance_total", 0) + metrics.get("total_switch_cost", 0)
+                if feasible else BIG_M
+            )
+            if not feasible:
+                fully_feasible = False
+
+            category_scores[category] += instance_score
+            instance_results.append({
+                "instance": sol_name,
+                "category": category,
+                "feasible": feasible,
+                "distance": metrics.get("distance_total", 0),
+                "transition_cost": metrics.get("total_switch_cost", 0),
+                "errors": errors,
+            })
+
+        total_weighted_sum = 0
+        for category, weight in COEFFS.items():
+            total_weighted_sum += category_scores[category] * weight
 
         return {
             "ok": True,
@@ -128,8 +183,8 @@ def process_full_submission(zip_path: str) -> dict:
         return _failed_result(f"Unexpected error: {fatal_e}")
 
     finally:
-        if os.path.exists(extract_path):
-            shutil.rmtree(extract_path)
+        if zip_ref is not None:
+            zip_ref.close()
         if os.path.exists(zip_path):
             os.remove(zip_path)
 
@@ -1,5 +1,7 @@
+import io
 import os
 import logging
+import zipfile
 
 COEFFS = {"small": 1.0, "medium": 0.5, "large": 0.2}
 BIG_M = 100000.0
@@ -11,14 +13,69 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.pa
 INSTANCES_ROOT = os.path.join(BASE_DIR, "data", "instances")
 
 
-def _discover_category_dirs(extract_root: str) -> tuple[dict, list]:
+class _ZipTree:
+    """
+    Vue en lecture seule de l'arborescence d'un ZIP, sans extraction sur le disque.
+    Les chemins sont ceux qu'aurait produits `extractall(root)` ; `walk` et `listdir`
+    imitent os.walk / os.listdir pour réutiliser les pré-checks de structure.
+    """
+
+    def __init__(self, zip_ref: zipfile.ZipFile, root: str):
+        self.zip_ref = zip_ref
+        self.root = root
+        self.children = {root: set()}  # dossier -> noms directs (fichiers et sous-dossiers)
+        self.files = {}  # chemin de fichier -> ZipInfo
+
+        for info in zip_ref.infolist():
+            parts = [part for part in info.filename.split("/") if part and part != "."]
+            if not parts or ".." in parts:
+                continue
+
+            path = root
+            for part in parts[:-1]:
+                self.children[path].add(part)
+                path = os.path.join(path, part)
+                self.children.setdefault(path, set())
+
+            self.children[path].add(parts[-1])
+            path = os.path.join(path, parts[-1])
+            if info.is_dir():
+                self.children.setdefault(path, set())
+            elif path not in self.children:
+                self.files[path] = info
+
+    def walk(self, top: str):
+        """Équivalent de os.walk(top) sur le contenu du ZIP."""
+        names = sorted(self.children.get(top, ()))
+        dirs = [name for name in names if os.path.join(top, name) in self.children]
+        files = [name for name in names if os.path.join(top, name) in self.files]
+        yield top, dirs, files
+        for dirname in dirs:
+            yield from self.walk(os.path.join(top, dirname))
+
+    def listdir(self, path: str) -> list:
+        """Équivalent de os.listdir(path) sur le contenu du ZIP."""
+        if path not in self.children:
+            raise FileNotFoundError(path)
+        return sorted(self.children[path])
+
+    def exists(self, path: str) -> bool:
+        return path in self.files
+
+    def open(self, path: str):
+        """Ouvre un fichier du ZIP en mode texte (mêmes conventions qu'open(path, "r"))."""
+        return io.TextIOWrapper(self.zip_ref.open(self.files[path]))
+
+
+def _discover_category_dirs(extract_root: str, walk=os.walk) -> tuple[dict, list]:
     """
     Trouve les dossiers small/medium/large n'importe où dans l'arborescence du ZIP.
     Retourne le chemin retenu par catégorie + d'éventuels avertissements.
+    `walk` permet de parcourir un _ZipTree au lieu du disque.
     """
     candidates = {"small": [], "medium": [], "large": []}
 
-    for root, dirs, _ in os.walk(extract_root):
+    for root, dirs, _ in walk(extract_root):
         for dirname in dirs:
             category = dirname.lower()
             if category in candidates:
@@ -74,11 +131,11 @@ def _parse_solution_filename(filename: str):
     return None
 
 
-def _index_category_solution_files(cat_path: str, category: str) -> dict:
+def _index_category_solution_files(cat_path: str, category: str, listdir=os.listdir) -> dict:
     """Indexe les fichiers .dat d'une catégorie par numéro d'instance reconnu."""
     parsed_candidates = {}
     unexpected = []
-    dat_files = [f for f in os.listdir(cat_path) if f.lower().endswith(".dat")]
+    dat_files = [f for f in listdir(cat_path) if f.lower().endswith(".dat")]
 
     for filename in dat_files:
         parsed = _parse_solution_filename(filename)
@@ -114,9 +171,9 @@ def _index_category_solution_files(cat_path: str, category: str) -> dict:
     }
 
 
-def _validate_zip_structure(extract_root: str, category_dirs: dict, discovery_warnings=None) -> dict:
+def _validate_zip_structure(extract_root: str, category_dirs: dict, discovery_warnings=None, listdir=os.listdir) -> dict:
     """
-    Pré-check de la structure du ZIP après extraction.
+    Pré-check de la structure du ZIP (extrait sous `extract_root`, ou lu via un _ZipTree).
     Retourne un rapport avec :
       - ok        : bool — True si tout est conforme
       - warnings  : list[str] — anomalies non bloquantes
@@ -152,7 +209,7 @@ def _validate_zip_structure(extract_root: str, category_dirs: dict, discovery_wa
             report["ok"] = False
         else:
             cat_report["present"] = True
-            category_index = _index_category_solution_files(cat_path, category)
+            category_index = _index_category_solution_files(cat_path, category, listdir)
             cat_report["dat_count"] = category_index["dat_count"]
             cat_report["unexpected"] = category_index["unexpected"]
             cat_report["duplicates"] = category_index["duplicates"]
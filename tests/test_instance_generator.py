@@ -5,10 +5,13 @@ import tempfile
 import pytest
 import numpy as np
 
+from backup.core.generator import instance_provider
 from backup.core.generator.instance_provider import (
     generer_instance,
+    generer_instances_batch,
     validate_instance,
     get_existing_instance_ids,
+    _format_block,
 )
 
 
@@ -106,6 +109,22 @@ class TestGenerateInstance:
         assert filepath1 == filepath2
         assert os.path.exists(filepath2)
 
+    def test_generate_instance_write_is_atomic(self, temp_dir, instance_generation_params, monkeypatch):
+        """Test that a failed write leaves neither a partial instance nor a temp file behind."""
+        import backup.core.generator.instance_provider as instance_provider
+
+        params = instance_generation_params.copy()
+        params["output_dir"] = temp_dir
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(instance_provider.os, "replace", failing_replace)
+        with pytest.raises(OSError, match="disk full"):
+            generer_instance(**params)
+
+        assert os.listdir(temp_dir) == []
+
     def test_generate_instance_min_params(self, temp_dir):
         """Test generating instance with minimum parameters."""
         filepath = generer_instance(
@@ -188,6 +207,106 @@ class TestGenerateInstance:
         
         assert filepath is not None
 
+    def test_generate_instance_values_within_bounds(self, temp_dir, instance_generation_params):
+        """Test that generated values respect the requested ranges."""
+        from backup.core.model.utils import parse_instance
+
+        params = instance_generation_params.copy()
+        params.update(output_dir=temp_dir, nb_s=20, nb_p=4, nb_v=6, seed=7)
+        instance = parse_instance(generer_instance(**params))
+
+        for camion in instance.camions.values():
+            assert params["min_capacite"] <= camion.capacity <= params["max_capacite"]
+            assert 1 <= camion.initial_product <= params["nb_p"]
+        for (i, j), cost in instance.costs.items():
+            if i == j:
+                assert cost == 0.0
+            else:
+                assert params["min_transition_cost"] <= cost <= params["max_transition_cost"]
+        for station in instance.stations.values():
+            assert any(q > 0 for q in station.demand.values())
+            assert all(q == 0 or params["min_demand"] <= q <= params["max_demand"] for q in station.demand.values())
+
+    def test_generate_instance_does_not_reseed_global_random(self, temp_dir, instance_generation_params):
+        """Test that a seeded generation leaves the global random state alone."""
+        import random
+
+        params = instance_generation_params.copy()
+        params.update(output_dir=temp_dir, seed=1)
+        random.seed(99)
+        expected = random.random()
+        random.seed(99)
+        generer_instance(**params)
+
+        assert random.random() == expected
+
+
+class TestGenerateInstancesBatch:
+    """Test suite for generer_instances_batch function."""
+
+    def test_batch_generates_in_order(self, temp_dir):
+        """Test that every config is generated and paths come back in order."""
+        configs = [
+            dict(id_inst=f"B{i}", nb_v=2, nb_d=1, nb_g=1, nb_s=3, nb_p=2, seed=i)
+            for i in range(3)
+        ]
+
+        paths = generer_instances_batch(configs, output_dir=temp_dir)
+
+        assert [os.path.basename(p) for p in paths] == [f"MPVRP_B{i}_s3_d1_p2.dat" for i in range(3)]
+        assert get_existing_instance_ids(temp_dir) == {"B0", "B1", "B2"}
+
+    def test_batch_reports_skipped_duplicates(self, temp_dir):
+        """Test that a duplicate ID without force yields None for that entry."""
+        config = dict(id_inst="DUP", nb_v=2, nb_d=1, nb_g=1, nb_s=3, nb_p=2, seed=1)
+
+        paths = generer_instances_batch([config, dict(config, nb_s=4)], output_dir=temp_dir)
+
+        assert paths[0] is not None
+        assert paths[1] is None
+
+    def test_batch_rejects_incomplete_config_before_generating(self, temp_dir):
+        """Test that a missing parameter fails fast instead of prompting."""
+        configs = [
+            dict(id_inst="OK", nb_v=2, nb_d=1, nb_g=1, nb_s=3, nb_p=2),
+            dict(id_inst="BAD", nb_v=2, nb_d=1, nb_g=1, nb_s=3),
+        ]
+
+        with pytest.raises(ValueError, match="nb_p"):
+            generer_instances_batch(configs, output_dir=temp_dir)
+        assert os.listdir(temp_dir) == []
+
+    def test_batch_scans_directory_once(self, temp_dir, monkeypatch):
+        """Test that the output directory is listed once for the whole batch."""
+        scans = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+        configs = [dict(id_inst=f"B{i}", nb_v=2, nb_d=1, nb_g=1, nb_s=3, nb_p=2) for i in range(5)]
+
+        paths = generer_instances_batch(configs + [configs[0]], output_dir=temp_dir)
+
+        assert paths[-1] is None
+        assert scans == [temp_dir]
+        assert get_existing_instance_ids(temp_dir) == {f"B{i}" for i in range(5)}
+        assert scans == [temp_dir]
+
+    def test_batch_seed_drives_a_shared_generator(self, temp_dir):
+        """Test that a batch seed makes unseeded configs reproducible but distinct."""
+        def contents(sub):
+            out = os.path.join(temp_dir, sub)
+            configs = [dict(id_inst=f"R{i}", nb_v=2, nb_d=1, nb_g=1, nb_s=3, nb_p=2) for i in range(2)]
+            paths = generer_instances_batch(configs, output_dir=out, seed=7)
+            bodies = []
+            for path in paths:
+                with open(path) as f:
+                    bodies.append(f.read().split('\n', 1)[1])  # Drop the UUID line
+            return bodies
+
+        first, second = contents("a"), contents("b")
+
+        assert first == second
+        assert first[0] != first[1]
+
 
 class TestValidateInstance:
     """Test suite for validate_instance function."""
@@ -334,6 +453,100 @@ class TestValidateInstance:
         assert len(errors) > 0
         assert any("demande" in e.lower() for e in errors)
 
+    def test_validate_stops_after_missing_entities(self):
+        """Test that a degenerate instance only reports the minimal-count errors."""
+        nb_p = 1
+        params = np.array([nb_p, 1, 1, 1, 0])
+        vehicles = np.empty((0, 4))
+        depots = np.array([[1, 50.0, 50.0, 10]])
+        garages = np.array([[1, 0.0, 0.0]])
+        stations = np.array([[1, 25.0, 25.0, 500]])
+        transition_costs = np.array([[0.0]])
+
+        errors, warnings = validate_instance(
+            params, vehicles, depots, garages, stations, transition_costs, nb_p
+        )
+
+        assert errors == ["Au moins 1 véhicule requis"]
+        assert warnings == []
+
+    def test_validate_overlapping_points_warns_in_pair_order(self):
+        """Test that nodes closer than 0.1 are reported, pair by pair."""
+        nb_p = 1
+        params = np.array([nb_p, 1, 1, 2, 1])
+        vehicles = np.array([[1, 5000, 1, 1]])
+        depots = np.array([[1, 10.0, 10.0, 3000]])
+        garages = np.array([[1, 10.0, 10.05]])
+        stations = np.array([
+            [1, 50.0, 50.0, 500],
+            [2, 10.0, 10.0, 500],
+        ])
+        transition_costs = np.array([[0.0]])
+
+        errors, warnings = validate_instance(
+            params, vehicles, depots, garages, stations, transition_costs, nb_p
+        )
+
+        assert errors == []
+        assert warnings == [
+            "Chevauchement: Dépôt 1 et Garage 1 (dist=0.05)",
+            "Chevauchement: Dépôt 1 et Station 2 (dist=0.00)",
+            "Chevauchement: Garage 1 et Station 2 (dist=0.05)",
+        ]
+
+    @pytest.mark.parametrize("block_size", [1, 7, 40])
+    def test_validate_overlap_blocks_match_all_pairs(self, monkeypatch, block_size):
+        """Test that the blocked overlap scan reports the same pairs, in order, for any block size."""
+        rng = np.random.default_rng(3)
+        nb_p, nb_d, nb_g, nb_s = 1, 3, 3, 14
+        coords = np.round(rng.uniform(0, 0.5, (nb_d + nb_g + nb_s, 2)), 2)
+        depots = np.column_stack([np.arange(1, nb_d + 1), coords[:nb_d], np.full(nb_d, 5000)])
+        garages = np.column_stack([np.arange(1, nb_g + 1), coords[nb_d:nb_d + nb_g]])
+        stations = np.column_stack([np.arange(1, nb_s + 1), coords[nb_d + nb_g:], np.full(nb_s, 500)])
+        args = (np.array([nb_p, nb_d, nb_g, nb_s, 1]), np.array([[1, 9000, 1, 1]]),
+                depots, garages, stations, np.array([[0.0]]), nb_p)
+
+        labels = [f"Dépôt {i}" for i in range(1, nb_d + 1)] + [f"Garage {i}" for i in range(1, nb_g + 1)] \
+            + [f"Station {i}" for i in range(1, nb_s + 1)]
+        expected = []
+        for i in range(len(coords)):
+            for j in range(i + 1, len(coords)):
+                dist = np.sqrt((coords[i, 0] - coords[j, 0])**2 + (coords[i, 1] - coords[j, 1])**2)
+                if dist < 0.1:
+                    expected.append(f"Chevauchement: {labels[i]} et {labels[j]} (dist={dist:.2f})")
+
+        monkeypatch.setattr(instance_provider, "_OVERLAP_BLOCK_SIZE", block_size)
+        errors, warnings = validate_instance(*args)
+
+        assert errors == []
+        assert len(expected) > 5
+        assert warnings == expected
+
+    def test_validate_reports_each_offending_vehicle(self):
+        """Test that every vehicle with a bad garage or initial product is listed in order."""
+        nb_p = 2
+        params = np.array([nb_p, 1, 1, 1, 3])
+        vehicles = np.array([
+            [1, 5000, 4, 1],
+            [2, 5000, 1, 3],
+            [3, 5000, 2, 0],
+        ])
+        depots = np.array([[1, 50.0, 50.0, 3000, 2000]])
+        garages = np.array([[1, 0.0, 0.0]])
+        stations = np.array([[1, 25.0, 25.0, 1000, 500]])
+        transition_costs = np.array([[0.0, 10.0], [10.0, 0.0]])
+
+        errors, _ = validate_instance(
+            params, vehicles, depots, garages, stations, transition_costs, nb_p
+        )
+
+        assert errors == [
+            "Véhicule 1 utilise garage inexistant 4",
+            "Véhicule 3 utilise garage inexistant 2",
+            "Véhicule 2 a produit initial invalide 3",
+            "Véhicule 3 a produit initial invalide 0",
+        ]
+
 
 class TestGetExistingInstanceIds:
     """Test suite for get_existing_instance_ids function."""
@@ -384,6 +597,44 @@ class TestGetExistingInstanceIds:
         assert "01" in ids
         assert len(ids) == 1
 
+    def test_cached_until_directory_changes(self, temp_dir):
+        """Test that the listing is reused until the directory is modified."""
+        open(os.path.join(temp_dir, "MPVRP_01_s5_d2_p2.dat"), 'w').close()
+        ids = get_existing_instance_ids(temp_dir)
+        ids.add("MUTATED")
+
+        assert get_existing_instance_ids(temp_dir) == {"01"}
+
+        mtime_ns = os.stat(temp_dir).st_mtime_ns
+        open(os.path.join(temp_dir, "MPVRP_02_s5_d2_p2.dat"), 'w').close()
+        os.utime(temp_dir, ns=(mtime_ns, mtime_ns + 10**9))
+
+        assert get_existing_instance_ids(temp_dir) == {"01", "02"}
+
+    def test_generated_instance_is_seen_immediately(self, temp_dir, instance_generation_params):
+        """Test that a freshly generated ID is reported even within the same clock tick."""
+        params = instance_generation_params.copy()
+        params["output_dir"] = temp_dir
+        assert get_existing_instance_ids(temp_dir) == set()
+
+        generer_instance(**params)
+
+        assert get_existing_instance_ids(temp_dir) == {params["id_inst"]}
+
+    def test_generated_instance_updates_cache_without_rescan(self, temp_dir, instance_generation_params, monkeypatch):
+        """Test that writing an instance adds its ID to the cache instead of invalidating it."""
+        scans = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+        params = instance_generation_params.copy()
+        params["output_dir"] = temp_dir
+
+        generer_instance(**params)
+        generer_instance(**dict(params, id_inst="SECOND"))
+
+        assert get_existing_instance_ids(temp_dir) == {params["id_inst"], "SECOND"}
+        assert scans == [temp_dir]
+
 
 class TestInstanceFileStructure:
     """Test suite for verifying the structure of generated instance files."""
@@ -460,3 +711,18 @@ class TestInstanceFileStructure:
         
         expected_lines = 1 + nb_p + nb_v + nb_d + nb_g + nb_s
         assert len(lines) == expected_lines
+
+    @pytest.mark.parametrize("fmt", ['%d', '%.1f', '%g'])
+    def test_format_block_matches_savetxt(self, fmt):
+        """Test that the in-memory formatting is byte-identical to np.savetxt."""
+        import io
+
+        rng = np.random.default_rng(3)
+        array = np.column_stack([np.arange(1, 6), rng.uniform(0, 1e6, (5, 3))])
+        if fmt == '%d':
+            array = array.astype(int)
+        buffer = io.StringIO()
+        np.savetxt(buffer, array, fmt=fmt, delimiter='\t')
+
+        assert _format_block(array, fmt) == buffer.getvalue()
+        assert _format_block(np.empty((0, 3)), fmt) == ""
@@ -82,6 +82,31 @@ class TestInstanceVerificatorLoadData:
         assert result is False
         assert len(verificator.errors) > 0
 
+    @pytest.mark.parametrize("vehicle_line, station_line", [
+        ("1\t5000\tnan\t1", "1\t25.0\t25.0\t1000\t500"),
+        ("1\t5000\t1\t1", "inf\t25.0\t25.0\t1000\t500"),
+    ])
+    def test_load_data_rejects_non_finite_ids(self, temp_dir, vehicle_line, station_line):
+        """Test that a NaN/Inf id or reference is a load error, not a garbage integer id."""
+        filepath = os.path.join(temp_dir, "nan_id.dat")
+        content = f"""# test-uuid
+2	1	1	1	1
+0.0	10.0
+10.0	0.0
+{vehicle_line}
+1	50.0	50.0	2000	1500
+1	0.0	0.0
+{station_line}
+"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+        verificator = InstanceVerificator(filepath)
+
+        assert verificator.load_data() is False
+        assert len(verificator.errors) == 1
+        assert verificator.errors[0].startswith("Erreur lors du chargement")
+
     def test_load_data_extracts_uuid(self, temp_dir):
         """Test that UUID is extracted from file."""
         filepath = os.path.join(temp_dir, "test_uuid.dat")
@@ -103,6 +128,18 @@ class TestInstanceVerificatorLoadData:
         
         assert verificator.data.get('uuid') == "12345678-1234-1234-1234-123456789abc"
 
+    @pytest.mark.parametrize("line, expected", [
+        ("# 12345678-1234-1234-1234-123456789abc", "12345678-1234-1234-1234-123456789abc"),
+        ("#\t12345678-ABCD-1234-1234-123456789ABC", "12345678-ABCD-1234-1234-123456789ABC"),
+        ("# 12345678-1234-1234-1234-123456789abg", None),
+        ("# 123456781-234-1234-1234-123456789abc", None),
+        ("# 12345678-1234-1234-1234-123456789abc0", None),
+        ("# test-uuid", None),
+    ])
+    def test_extract_uuid(self, line, expected):
+        """Test that only well-formed 8-4-4-4-12 UUID comments are recognized."""
+        assert InstanceVerificator._extract_uuid(line) == expected
+
 
 class TestInstanceVerificatorMinimumElements:
     """Test suite for check_minimum_elements method."""
@@ -199,6 +236,34 @@ class TestInstanceVerificatorValidity:
         
         assert any("garage" in e.lower() for e in verificator.errors)
 
+    def test_invalid_references_reported_once_each(self, temp_dir):
+        """Test unknown garages are reported once each and invalid products once per vehicle."""
+        filepath = os.path.join(temp_dir, "invalid_refs.dat")
+        content = """# test-uuid
+2	1	1	1	3
+0.0	10.0
+10.0	0.0
+1	5000	7	1
+2	5000	3	3
+3	5000	7	0
+1	50.0	50.0	2000	1500
+1	0.0	0.0
+1	25.0	25.0	1000	500
+"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+        verificator = InstanceVerificator(filepath)
+        verificator.load_data()
+        verificator.check_validity()
+
+        assert verificator.errors == [
+            "❌ Garage 3 utilisé par véhicule mais n'existe pas",
+            "❌ Garage 7 utilisé par véhicule mais n'existe pas",
+            "❌ Produit initial 3 invalide pour véhicule 2",
+            "❌ Produit initial 0 invalide pour véhicule 3",
+        ]
+
 
 class TestInstanceVerificatorCapacityDemand:
     """Test suite for check_capacity_demand method."""
@@ -284,6 +349,40 @@ class TestInstanceVerificatorFullVerification:
         assert result is False
         assert len(verificator.errors) > 0
 
+    def test_verify_stops_after_fatal_error(self, temp_dir, capsys):
+        """Test that an instance without stations stops after the minimum-elements check."""
+        filepath = os.path.join(temp_dir, "no_station.dat")
+        content = """# test-uuid
+2	1	1	0	1
+0.0	10.0
+10.0	0.0
+1	5000	1	1
+1	50.0	50.0	2000	1500
+1	0.0	0.0
+"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+        verificator = InstanceVerificator(filepath)
+        result = verificator.verify()
+        output = capsys.readouterr().out
+
+        assert result is False
+        assert verificator.errors == ["Au moins 1 Stations requis, trouvé : 0"]
+        assert "Vérifications des IDs" not in output
+        assert "RAPPORT DE VÉRIFICATION" in output
+
+    def test_verify_silent_mode_keeps_report(self, sample_instance_file, capsys):
+        """Test that verbose=False prints nothing but keeps the same messages in report."""
+        InstanceVerificator(sample_instance_file).verify()
+        verbose_output = capsys.readouterr().out
+
+        verificator = InstanceVerificator(sample_instance_file, verbose=False)
+        verificator.verify()
+
+        assert capsys.readouterr().out == ""
+        assert "\n".join(verificator.report) + "\n" == verbose_output
+
 
 class TestInstanceVerificatorWithRealInstances:
     """Test suite using real instance files if available."""
@@ -337,6 +436,33 @@ class TestInstanceVerificatorGeometry:
         geometry_errors = [e for e in verificator.errors if "géométr" in e.lower()]
         assert len(geometry_errors) == 0
 
+    def test_geometry_stats_refreshed_on_reload(self, temp_dir):
+        """Test the shared block statistics are recomputed after load_data."""
+        filepath = os.path.join(temp_dir, "nan_coords.dat")
+        content = """# test-uuid
+2	1	1	1	1
+0.0	10.0
+10.0	0.0
+1	5000	1	1
+1	50.0	50.0	2000	1500
+1	0.0	0.0
+1	nan	25.0	1000	500
+"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+        verificator = InstanceVerificator(filepath)
+        verificator.load_data()
+        verificator.check_geometry()
+        assert verificator.errors == ["❌ NaN ou Inf détectés dans les coordonnées"]
+
+        with open(filepath, 'w') as f:
+            f.write(content.replace("nan", "25.0"))
+        verificator.errors = []
+        verificator.load_data()
+        verificator.check_geometry()
+        assert verificator.errors == []
+
 
 class TestInstanceVerificatorTriangleInequality:
     """Test suite for triangle inequality check on transition matrix."""
@@ -352,6 +478,29 @@ class TestInstanceVerificatorTriangleInequality:
         # Check runs without crashing
         # Warnings may or may not be generated depending on instance
 
+    def test_triangle_inequality_reports_sorted_violations(self):
+        """Test violations are counted per triplet and reported by decreasing savings."""
+        import numpy as np
+
+        verificator = InstanceVerificator("unused.dat")
+        verificator.data = {
+            'nb_p': 3,
+            'transition_costs': np.array([
+                [0.0, 10.0, 1.0],
+                [1.0, 0.0, 6.0],
+                [1.0, 1.0, 0.0],
+            ]),
+        }
+
+        verificator.check_triangle_inequality()
+
+        assert verificator.warnings == [
+            "⚠️ Inégalité triangulaire non respectée (2 cas) :",
+            "   → Le solveur pourrait utiliser des changements intermédiaires",
+            "   - P1→P2 : direct=10.0 > via P3 (2.0) | Économie: 8.0",
+            "   - P2→P3 : direct=6.0 > via P1 (2.0) | Économie: 4.0",
+        ]
+
 
 class TestInstanceVerificatorGeographicOverlap:
     """Test suite for geographic overlap check."""
@@ -391,3 +540,32 @@ class TestInstanceVerificatorGeographicOverlap:
         
         # Should detect overlap (may be warning or info)
         # The important thing is it doesn't crash
+
+    @pytest.mark.parametrize("block_size", [1, 5, 1 << 20])
+    def test_overlap_warnings_list_pairs_in_order(self, temp_dir, monkeypatch, block_size):
+        """Test every overlapping pair is reported once, depots first, then garages, then stations."""
+        monkeypatch.setattr(InstanceVerificator, "_OVERLAP_BLOCK_SIZE", block_size)
+        filepath = os.path.join(temp_dir, "overlap_pairs.dat")
+        content = """# test-uuid
+2	1	1	2	1
+0.0	10.0
+10.0	0.0
+1	5000	1	1
+1	50.0	50.0	2000	1500
+1	50.0	50.05
+1	10.0	10.0	1000	500
+2	50.0	50.0	0	500
+"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+        verificator = InstanceVerificator(filepath)
+        verificator.load_data()
+        verificator.check_geographic_overlap()
+
+        assert verificator.warnings == [
+            "⚠️ 3 chevauchement(s) détecté(s):",
+            "   - Dépôt 1 et Garage 1 (dist=0.050)",
+            "   - Dépôt 1 et Station 2 (dist=0.000)",
+            "   - Garage 1 et Station 2 (dist=0.050)",
+        ]
@@ -1,7 +1,8 @@
+import numpy as np
 import pytest
 
 from backup.core.model.schemas import (
-    Camion, Depot, Garage, Station, Instance,
+    Camion, Depot, Garage, Station, Instance, MatrixMapping,
     ParsedSolutionVehicle, ParsedSolutionDat
 )
 
@@ -35,6 +36,19 @@ class TestCamion:
             camion = Camion(id="K1", capacity=10000, garage_id=1, initial_product=product)
             assert camion.initial_product == product
 
+    def test_entities_use_slots(self):
+        """Test that the per-node entities carry no per-instance __dict__."""
+        entities = [
+            Camion(id="K1", capacity=10000, garage_id=1, initial_product=1),
+            Depot(id="D1", location=(0.0, 0.0), stocks={0: 10}),
+            Garage(id="G1", location=(0.0, 0.0)),
+            Station(id="S1", location=(0.0, 0.0), demand={0: 10}),
+        ]
+        for entity in entities:
+            assert not hasattr(entity, "__dict__")
+            with pytest.raises(AttributeError):
+                entity.unknown_field = 1
+
 
 class TestDepot:
     """Test suite for Depot dataclass."""
@@ -207,3 +221,24 @@ class TestParsedSolutionDat:
         )
         with pytest.raises(AttributeError):
             solution.vehicles = []
+
+
+class TestMatrixMapping:
+    """Test suite for the MatrixMapping dict view."""
+
+    def test_matrix_mapping_behaves_like_dict(self):
+        """Test that the view compares equal to the equivalent dict."""
+        view = MatrixMapping(np.array([[0.0, 15.0], [20.0, 0.0]]), {"A": 0, "B": 1})
+
+        assert view == {("A", "A"): 0.0, ("A", "B"): 15.0, ("B", "A"): 20.0, ("B", "B"): 0.0}
+        assert len(view) == 4
+        assert view[("B", "A")] == 20.0
+
+    def test_matrix_mapping_missing_key(self):
+        """Test that unknown keys behave like missing dict keys."""
+        view = MatrixMapping(np.zeros((1, 1)), {0: 0})
+
+        assert view.get((0, 5), -1.0) == -1.0
+        assert (0, 5) not in view
+        with pytest.raises(KeyError):
+            view["bad"]
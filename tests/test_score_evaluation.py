@@ -35,13 +35,10 @@ def test_process_full_submission_happy_path_with_minimal_dataset(tmp_path, monke
 		(cat_dir / f"MPVRP_{prefix}_001_test.dat").write_text("instance", encoding="utf-8")
 	monkeypatch.setattr(score_evaluation, "INSTANCES_ROOT", str(instances_root))
 
-	import backup.core.model.feasibility as feasibility
-	import backup.core.model.utils as model_utils
-
-	monkeypatch.setattr(model_utils, "parse_instance", lambda _path: object())
-	monkeypatch.setattr(model_utils, "parse_solution", lambda _path: object())
+	monkeypatch.setattr(score_evaluation, "parse_instance_cached", lambda _path: object())
+	monkeypatch.setattr(score_evaluation, "parse_solution", lambda _path: object())
 	monkeypatch.setattr(
-		feasibility,
+		score_evaluation,
 		"verify_solution",
 		lambda _i, _s: ([], {"distance_total": 10.0, "total_switch_cost": 5.0}),
 	)
@@ -63,3 +60,62 @@ def test_process_full_submission_happy_path_with_minimal_dataset(tmp_path, monke
 	assert not submission_zip.exists()
 
 
+def test_process_full_submission_reads_solutions_without_extracting(tmp_path, monkeypatch):
+	monkeypatch.setattr(score_evaluation, "NUMBER_OF_INSTANCES_PER_CATEGORY", 1)
+	monkeypatch.setattr(scoring_utils, "NUMBER_OF_INSTANCES_PER_CATEGORY", 1)
+	monkeypatch.chdir(tmp_path)
+
+	instances_root = tmp_path / "instances"
+	cat_dir = instances_root / "small"
+	cat_dir.mkdir(parents=True)
+	(cat_dir / "MPVRP_S_001_test.dat").write_text("instance", encoding="utf-8")
+	monkeypatch.setattr(score_evaluation, "INSTANCES_ROOT", str(instances_root))
+
+	seen = []
+	monkeypatch.setattr(score_evaluation, "parse_instance_cached", lambda _path: object())
+	monkeypatch.setattr(score_evaluation, "parse_solution", lambda source: seen.append(source.read()))
+	monkeypatch.setattr(score_evaluation, "verify_solution", lambda _i, _s: ([], {"distance_total": 1.0}))
+
+	submission_zip = tmp_path / "submission.zip"
+	with zipfile.ZipFile(submission_zip, "w") as zf:
+		zf.writestr("SMALL/Sol_S_001.dat", "1: G1 - G1\n")
+
+	result = score_evaluation.process_full_submission(str(submission_zip))
+
+	assert result["ok"] is True
+	assert result["category_stats"]["small"] == 1
+	assert seen == ["1: G1 - G1\n"]
+	assert sorted(p.name for p in tmp_path.iterdir()) == ["instances"]
+
+
+def test_process_full_submission_same_results_with_worker_processes(tmp_path, monkeypatch):
+	monkeypatch.setattr(score_evaluation, "NUMBER_OF_INSTANCES_PER_CATEGORY", 2)
+	monkeypatch.setattr(scoring_utils, "NUMBER_OF_INSTANCES_PER_CATEGORY", 2)
+
+	solution = score_evaluation.BASE_DIR + "/data/solutions/Sol_MPVRP_S_002_s10_d2_p3.dat"
+	with open(solution, encoding="utf-8") as fh:
+		content = fh.read()
+
+	results = []
+	for workers in (1, 2):
+		monkeypatch.setattr(score_evaluation, "SCORING_WORKERS", workers)
+		submission_zip = tmp_path / f"submission_{workers}.zip"
+		with zipfile.ZipFile(submission_zip, "w") as zf:
+			zf.writestr("small/Sol_S_001.dat", "1: garbage\n")
+			zf.writestr("small/Sol_MPVRP_S_002_s10_d2_p3.dat", content)
+		results.append(score_evaluation.process_full_submission(str(submission_zip)))
+
+	serial, parallel = results
+	assert serial["ok"] is True
+	assert serial["instance_results"][1]["instance"] == "Sol_S_002.dat"
+	assert serial["instance_results"][0]["errors"][0].startswith("Technical error during parsing")
+	assert parallel == serial
+
+
+def test_parse_workers_falls_back_to_serial():
+	assert score_evaluation._parse_workers("4") == 4
+	assert score_evaluation._parse_workers("auto") == 1
+	assert score_evaluation._parse_workers("") == 1
+	assert score_evaluation._parse_workers("0") == 1
+	assert score_evaluation._parse_workers("-3") == 1
+	assert score_evaluation._parse_workers(None) == 1
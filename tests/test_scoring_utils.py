@@ -52,3 +52,32 @@ def test_failed_result_returns_expected_shape():
     assert set(result["category_stats"].keys()) == {"small", "medium", "large"}
 
 
+def test_zip_tree_matches_extracted_layout(tmp_path):
+    import zipfile
+
+    archive = tmp_path / "submission.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("Small/Sol_S_001.dat", "sol")
+        zf.writestr("nested/small/Sol_S_002.dat", "sol")
+        zf.writestr("nested/medium/readme.txt", "hello")
+        zf.writestr("empty/large/", "")
+
+    root = str(tmp_path / "virtual")
+    with zipfile.ZipFile(archive) as zf:
+        tree = utils._ZipTree(zf, root)
+        category_dirs, warnings = utils._discover_category_dirs(root, tree.walk)
+        report = utils._validate_zip_structure(root, category_dirs, warnings, tree.listdir)
+        with tree.open(category_dirs["small"] + "/Sol_S_001.dat") as fh:
+            content = fh.read()
+
+    assert category_dirs == {
+        "small": f"{root}/Small",
+        "medium": f"{root}/nested/medium",
+        "large": f"{root}/empty/large",
+    }
+    assert any("small" in warning for warning in warnings)
+    assert report["by_category"]["small"]["files_by_instance"] == {"001": "Sol_S_001.dat"}
+    assert report["by_category"]["large"]["present"] is True
+    assert report["by_category"]["large"]["dat_count"] == 0
+    assert content == "sol"
+    assert not (tmp_path / "virtual").exists()
@@ -7,11 +7,18 @@ import pytest
 from backup.core.model.utils import (
     euclidean_distance,
     parse_instance,
+    parse_instance_cached,
+    _parse_instance_cached,
     compute_distances,
     _parse_solution_route_token,
     _parse_solution_product_token,
+    _parse_solution_route,
+    _parse_solution_products,
     solution_node_key,
     parse_solution,
+    GARAGE,
+    DEPOT,
+    STATION,
 )
 from backup.core.model.schemas import Instance
 
@@ -126,6 +133,27 @@ class TestParseInstance:
         assert instance.costs[(0, 1)] == 15.0
         assert instance.costs[(1, 0)] == 15.0
 
+    def test_parse_instance_cost_matrix(self, sample_instance_file):
+        """Test that the dense cost matrix agrees with the costs dict."""
+        instance = parse_instance(sample_instance_file)
+
+        assert instance.cost_mat.shape == (2, 2)
+        for (p, q), cost in instance.costs.items():
+            assert instance.cost_mat[p, q] == cost
+
+    def test_parse_instance_stock_demand_matrices(self, sample_instance_file):
+        """Test that the dense stock/demand matrices agree with the depot and station dicts."""
+        instance = parse_instance(sample_instance_file)
+
+        assert instance.depot_stock.shape == (instance.num_depots, instance.num_products)
+        assert instance.station_demand.shape == (instance.num_stations, instance.num_products)
+        for row, depot in enumerate(instance.depots.values()):
+            for p, stock in depot.stocks.items():
+                assert instance.depot_stock[row, p] == stock
+        for row, station in enumerate(instance.stations.values()):
+            for p, demand in station.demand.items():
+                assert instance.station_demand[row, p] == demand
+
     def test_parse_instance_distances_computed(self, sample_instance_file):
         """Test that distances are computed after parsing."""
         instance = parse_instance(sample_instance_file)
@@ -136,6 +164,17 @@ class TestParseInstance:
         assert ("G1", "D1") in instance.distances
         assert ("D1", "S1") in instance.distances
 
+    def test_parse_instance_distance_matrix(self, sample_instance_file):
+        """Test that the dense distance matrix agrees with the distances dict."""
+        instance = parse_instance(sample_instance_file)
+
+        n = len(instance.node_index)
+        assert n == 4  # D1, G1, S1, S2
+        assert instance.dmat.shape == (n, n)
+        for (a, b), dist in instance.distances.items():
+            assert instance.dmat[instance.node_index[a], instance.node_index[b]] == dist
+        assert instance.distances == compute_distances(instance)
+
     def test_parse_nonexistent_file(self):
         """Test parsing a file that doesn't exist."""
         with pytest.raises(FileNotFoundError):
@@ -146,6 +185,98 @@ class TestParseInstance:
         with pytest.raises(RuntimeError):
             parse_instance(invalid_instance_file)
 
+    def test_parse_instance_numeric_id_lookups(self, sample_instance_file):
+        """Test that entities are also indexed by their numeric id."""
+        instance = parse_instance(sample_instance_file)
+
+        assert instance.camions_by_id == {1: instance.camions["K1"]}
+        assert instance.depots_by_id == {1: instance.depots["D1"]}
+        assert instance.stations_by_id == {1: instance.stations["S1"], 2: instance.stations["S2"]}
+
+    def test_parse_instance_cached(self, sample_instance_file):
+        """Test that an unchanged file is parsed only once on the cached path."""
+        assert parse_instance_cached(sample_instance_file) is parse_instance_cached(sample_instance_file)
+
+    def test_parse_instance_not_cached(self, sample_instance_file):
+        """Test that parse_instance (uploads) always parses and leaves the scoring cache alone."""
+        _parse_instance_cached.cache_clear()
+
+        assert parse_instance(sample_instance_file) is not parse_instance(sample_instance_file)
+        assert _parse_instance_cached.cache_info().currsize == 0
+
+    def test_parse_instance_cache_holds_a_full_submission(self, sample_instance_file, temp_dir):
+        """Test that a second pass over 150 instances (one submission) is served entirely from the cache."""
+        with open(sample_instance_file) as f:
+            content = f.read()
+        paths = []
+        for i in range(150):
+            path = os.path.join(temp_dir, f"instance_{i:03d}.dat")
+            with open(path, 'w') as f:
+                f.write(content)
+            paths.append(path)
+
+        _parse_instance_cached.cache_clear()
+        first_pass = [parse_instance_cached(path) for path in paths]
+        second_pass = [parse_instance_cached(path) for path in paths]
+
+        assert all(a is b for a, b in zip(first_pass, second_pass))
+        info = _parse_instance_cached.cache_info()
+        assert (info.hits, info.misses) == (150, 150)
+
+    def test_parse_instance_cache_invalidated_on_change(self, sample_instance_file):
+        """Test that a modified file is parsed again."""
+        instance = parse_instance_cached(sample_instance_file)
+
+        with open(sample_instance_file) as f:
+            content = f.read()
+        with open(sample_instance_file, 'w') as f:
+            f.write(content.replace("3000\t2000", "30000\t2000"))
+
+        reparsed = parse_instance_cached(sample_instance_file)
+        assert reparsed is not instance
+        assert reparsed.depots["D1"].stocks[0] == 30000
+
+    def test_parse_truncated_file(self, temp_dir):
+        """Test that a file with a missing station line is rejected."""
+        filepath = os.path.join(temp_dir, "truncated.dat")
+        content = """# test-uuid
+2	1	1	2	1
+0.0	15.0
+15.0	0.0
+1	5000	1	1
+1	50.0	50.0	3000	2000
+1	0.0	0.0
+1	25.0	25.0	1000	500
+"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+        with pytest.raises(RuntimeError):
+            parse_instance(filepath)
+
+    @pytest.mark.parametrize("station_line", [
+        "1\t25.0\t25.0\t1500.7\t500",
+        "1\t25.0\t25.0\tnan\t500",
+        "1.5\t25.0\t25.0\t1500\t500",
+    ])
+    def test_parse_non_integer_quantity_rejected(self, temp_dir, station_line):
+        """Test that a fractional or non-finite id or demand is rejected instead of truncated."""
+        filepath = os.path.join(temp_dir, "fractional.dat")
+        content = f"""# test-uuid
+2	1	1	1	1
+0.0	15.0
+15.0	0.0
+1	5000	1	1
+1	50.0	50.0	3000	2000
+1	0.0	0.0
+{station_line}
+"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+        with pytest.raises(RuntimeError, match="valeur entière attendue"):
+            parse_instance(filepath)
+
 
 class TestComputeDistances:
     """Test suite for compute_distances function."""
@@ -181,6 +312,20 @@ class TestComputeDistances:
             if (node_id, node_id) in distances:
                 assert distances[(node_id, node_id)] == 0.0
 
+    def test_compute_distances_matches_euclidean(self, sample_instance):
+        """Test that vectorized distances match euclidean_distance for every pair."""
+        sample_instance.garages["G1"].location = (0.0, 0.0)
+        sample_instance.depots["D1"].location = (3.0, 4.0)
+        sample_instance.stations["S1"].location = (-1.5, 7.25)
+        locations = {"G1": (0.0, 0.0), "D1": (3.0, 4.0), "S1": (-1.5, 7.25)}
+
+        distances = compute_distances(sample_instance)
+
+        assert len(distances) == len(locations) ** 2
+        for a, loc_a in locations.items():
+            for b, loc_b in locations.items():
+                assert distances[(a, b)] == pytest.approx(euclidean_distance(loc_a, loc_b))
+
 
 class TestParseSolutionRouteToken:
     """Test suite for _parse_solution_route_token function."""
@@ -265,6 +410,31 @@ class TestParseSolutionProductToken:
             _parse_solution_product_token("invalid")
 
 
+class TestParseSolutionLines:
+    """Test suite for _parse_solution_route and _parse_solution_products."""
+
+    def test_route_line_matches_token_parsing(self):
+        """Test that a whole route line parses like its individual tokens."""
+        line = " 1 - 1 [1500] - 3(1000) - 2 (500) - 1"
+        expected = [_parse_solution_route_token(t) for t in line.split("-")]
+
+        assert _parse_solution_route(line) == expected
+
+    def test_product_line_matches_token_parsing(self):
+        """Test that a whole product line parses like its individual tokens."""
+        line = " 0(0.0) - 1(150.5) - 1 ( 150 ) - 0(1e3)"
+        expected = [_parse_solution_product_token(t) for t in line.split("-")]
+
+        assert _parse_solution_products(line) == expected
+
+    def test_malformed_lines_raise(self):
+        """Test that malformed lines still raise the token errors."""
+        with pytest.raises(ValueError):
+            _parse_solution_route("1 - 1[x] - 1")
+        with pytest.raises(ValueError, match="Invalid product token"):
+            _parse_solution_products("0(0.0) - 1")
+
+
 class TestSolutionNodeKey:
     """Test suite for solution_node_key function."""
 
@@ -320,6 +490,26 @@ class TestParseSolution:
         assert len(vehicle.products) > 0
         assert len(vehicle.nodes) == len(vehicle.products)
 
+    def test_parse_solution_route_arrays(self, sample_solution_file):
+        """Test that the route arrays mirror the node dicts."""
+        solution = parse_solution(sample_solution_file)
+
+        vehicle = solution.vehicles[0]
+        assert vehicle.kinds.tolist() == [GARAGE, DEPOT, STATION, STATION, GARAGE]
+        assert vehicle.ids.tolist() == [n["id"] for n in vehicle.nodes]
+        assert vehicle.qtys.tolist() == [float(n["qty"]) for n in vehicle.nodes]
+        assert vehicle.node_keys == ["G1", "D1", "S1", "S2", "G1"]
+
+    def test_parse_solution_from_text_stream(self, sample_solution_file):
+        """Test that an open text stream parses like the file path."""
+        with open(sample_solution_file) as fh:
+            from_stream = parse_solution(fh)
+        from_path = parse_solution(sample_solution_file)
+
+        assert from_stream.metrics == from_path.metrics
+        assert from_stream.vehicles[0].nodes == from_path.vehicles[0].nodes
+        assert from_stream.vehicles[0].products == from_path.vehicles[0].products
+
     def test_parse_nonexistent_solution(self):
         """Test parsing a solution file that doesn't exist."""
         with pytest.raises(FileNotFoundError):
@@ -348,3 +538,10 @@ test
         
         assert len(solution.vehicles) == 2
         assert solution.metrics["used_vehicles"] == 2
+
+        # Routes are also stored concatenated, with per-vehicle offsets
+        assert solution.veh_ids.tolist() == [1, 2]
+        assert solution.veh_offsets.tolist() == [0, 4, 8]
+        assert solution.qtys.tolist() == [0.0, 1000.0, 1000.0, 0.0, 0.0, 500.0, 500.0, 0.0]
+        assert solution.product_offsets.tolist() == [0, 4, 8]
+        assert solution.vehicles[1].ids.tolist() == [1, 1, 2, 1]